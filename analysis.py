@@ -20,7 +20,22 @@ return None or default values. They are designed to be called by the API
 server to produce a richer response for end users.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Bound once so the per-line scans skip the attribute lookup on each dict
+_get = dict.get
+
+
+def _valid_points(results: List[Dict[str, str]]) -> Iterator[Tuple[int, int]]:
+    """Yield (points_for, points_against) for games with parseable scores."""
+    for game in results:
+        try:
+            yield int(game['team_points']), int(game['opp_points'])
+        except (KeyError, ValueError, TypeError):
+            continue
+
 
 def calculate_basic_metrics(report: Dict[str, object]) -> Dict[str, Optional[float]]:
     """Compute average points scored and allowed over all games in the report.
@@ -38,72 +53,49 @@ def calculate_basic_metrics(report: Dict[str, object]) -> Dict[str, Optional[flo
             'avg_points_for': None,
             'avg_points_against': None,
         }
-    total_for = 0
-    total_against = 0
-    count = 0
-    for game in results:
-        try:
-            pf = int(game['team_points'])
-            pa = int(game['opp_points'])
-        except (KeyError, ValueError, TypeError):
-            continue
-        total_for += pf
-        total_against += pa
-        count += 1
-    if count == 0:
+    # One row per valid game: column 0 = points for, column 1 = points against
+    points = np.fromiter(_valid_points(results), dtype=np.dtype((np.int64, 2)))
+    if points.size == 0:
         return {
             'avg_points_for': None,
             'avg_points_against': None,
         }
+    avg_for, avg_against = points.mean(axis=0)
     return {
-        'avg_points_for': total_for / count,
-        'avg_points_against': total_against / count,
+        'avg_points_for': float(avg_for),
+        'avg_points_against': float(avg_against),
     }
 
 
-def calculate_ats_ou_rates(report: Dict[str, object]) -> Dict[str, Optional[str]]:
-    """Calculate ATS (against the spread) and over/under rates for the last 10 games.
-
-    Args:
-        report: Data dictionary containing 'lines'.
+def _line_counts(lines: List[Dict[str, str]]) -> Tuple[int, int, int, int, int]:
+    """Walk the 10 most recent lines once, counting ATS wins and overs.
 
     Returns:
-        Dictionary with ATS and OU records in 'xW-yL' and 'xO-yU' format,
-        respectively; None if insufficient data.
+        (n, ats_wins, overs) for the last 10 games followed by
+        (ats_wins, overs) for the last 5.
     """
-    lines: List[Dict[str, str]] = report.get('lines', [])  # type: ignore
-    if not lines:
-        return {'ats_rate': None, 'ou_rate': None}
     last_n = lines[:10]
-    ats_wins = sum(1 for l in last_n if l.get('ats') == 'W')
-    ou_over = sum(1 for l in last_n if l.get('ou') == 'O')
-    n = len(last_n)
+    # Booleans sum as ints; the 5-game window is a prefix of the 10-game one
+    ats = [_get(l, 'ats') == 'W' for l in last_n]
+    ou = [_get(l, 'ou') == 'O' for l in last_n]
+    return len(last_n), sum(ats), sum(ou), sum(ats[:5]), sum(ou[:5])
+
+
+def _rates(n: int, ats_wins: int, ou_over: int) -> Dict[str, Optional[str]]:
     return {
         'ats_rate': f"{ats_wins}W-{n - ats_wins}L",
         'ou_rate': f"{ou_over}O-{n - ou_over}U",
     }
 
 
-def generate_parlay_suggestions(report: Dict[str, object]) -> List[Dict[str, object]]:
-    """Generate simple parlay suggestions based on recent ATS and OU performance.
-
-    Uses heuristics: if a team has more over results than under, suggest over
-    totals; if they cover the spread often, suggest them to cover; also
-    includes a player prop placeholder based on injuries.
-
-    Args:
-        report: Data dictionary containing 'lines' and 'injuries'.
-
-    Returns:
-        List of leg dictionaries with description and confidence labels.
-    """
-    lines: List[Dict[str, str]] = report.get('lines', [])  # type: ignore
-    injuries: List[Dict[str, str]] = report.get('injuries', [])  # type: ignore
+def _parlay_legs(
+    has_lines: bool,
+    ats_count: int,
+    over_count: int,
+    injuries: List[Dict[str, str]],
+) -> List[Dict[str, object]]:
     legs = []
-    if lines:
-        last5 = lines[:5]
-        over_count = sum(1 for l in last5 if l.get('ou') == 'O')
-        ats_count = sum(1 for l in last5 if l.get('ats') == 'W')
+    if has_lines:
         if over_count >= 3:
             legs.append({
                 'type': 'total',
@@ -141,4 +133,60 @@ def generate_parlay_suggestions(report: Dict[str, object]) -> List[Dict[str, obj
             'confidence': 'Low',
             'note': f"Starters {', '.join(injured_names)} are out; consider backups over stats."
         })
-    return legs
\ No newline at end of file
+    return legs
+
+
+def summarize(report: Dict[str, object]) -> Tuple[Dict[str, Optional[str]], List[Dict[str, object]]]:
+    """Compute ATS/O-U rates and parlay suggestions with one pass over 'lines'.
+
+    Args:
+        report: Data dictionary containing 'lines' and 'injuries'.
+
+    Returns:
+        A (rates, legs) tuple identical to calling calculate_ats_ou_rates and
+        generate_parlay_suggestions separately.
+    """
+    lines: List[Dict[str, str]] = report.get('lines', [])  # type: ignore
+    injuries: List[Dict[str, str]] = report.get('injuries', [])  # type: ignore
+    if not lines:
+        return {'ats_rate': None, 'ou_rate': None}, _parlay_legs(False, 0, 0, injuries)
+    n, ats10, ou10, ats5, ou5 = _line_counts(lines)
+    return _rates(n, ats10, ou10), _parlay_legs(True, ats5, ou5, injuries)
+
+
+def calculate_ats_ou_rates(report: Dict[str, object]) -> Dict[str, Optional[str]]:
+    """Calculate ATS (against the spread) and over/under rates for the last 10 games.
+
+    Args:
+        report: Data dictionary containing 'lines'.
+
+    Returns:
+        Dictionary with ATS and OU records in 'xW-yL' and 'xO-yU' format,
+        respectively; None if insufficient data.
+    """
+    lines: List[Dict[str, str]] = report.get('lines', [])  # type: ignore
+    if not lines:
+        return {'ats_rate': None, 'ou_rate': None}
+    n, ats10, ou10, _, _ = _line_counts(lines)
+    return _rates(n, ats10, ou10)
+
+
+def generate_parlay_suggestions(report: Dict[str, object]) -> List[Dict[str, object]]:
+    """Generate simple parlay suggestions based on recent ATS and OU performance.
+
+    Uses heuristics: if a team has more over results than under, suggest over
+    totals; if they cover the spread often, suggest them to cover; also
+    includes a player prop placeholder based on injuries.
+
+    Args:
+        report: Data dictionary containing 'lines' and 'injuries'.
+
+    Returns:
+        List of leg dictionaries with description and confidence labels.
+    """
+    lines: List[Dict[str, str]] = report.get('lines', [])  # type: ignore
+    injuries: List[Dict[str, str]] = report.get('injuries', [])  # type: ignore
+    if not lines:
+        return _parlay_legs(False, 0, 0, injuries)
+    _, _, _, ats5, ou5 = _line_counts(lines)
+    return _parlay_legs(True, ats5, ou5, injuries)
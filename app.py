@@ -15,15 +15,34 @@ Endpoints:
 
 See `analysis.py` and `fetch_data.py` for underlying data processing.
 """
+import gzip
+import hashlib
 import json
 import os
 import logging
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import io
-from urllib.parse import unquote
+from urllib.parse import parse_qs, unquote, urlparse
 import requests
 from dotenv import load_dotenv
 
+try:
+    import ijson
+except ImportError:  # optional; large report lists are then parsed in one go
+    ijson = None
+_STREAM_JSON_ERRORS = (ijson.JSONError,) if ijson is not None else ()
+
+try:
+    import orjson
+
+    def _json_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson is optional; stdlib json is the slower fallback
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 from fetch_data import (
     get_player_statistics_api_nba,
     get_scores_rapid,
@@ -31,9 +50,10 @@ from fetch_data import (
     get_team_injuries,
     get_odds_for_games,
 )
+from cache import TTLCache
 from bdl import team_lookup as bdl_team_lookup, games_by_team as bdl_games_by_team, injuries_by_team as bdl_injuries_by_team
 from odds_api import current_odds as odds_current_odds, find_odds_for_matchup as odds_find_for_matchup
-from analysis import calculate_basic_metrics, calculate_ats_ou_rates, generate_parlay_suggestions
+from analysis import calculate_basic_metrics, summarize
 
 # Load environment variables
 load_dotenv()
@@ -49,14 +69,45 @@ SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
 # NBA season configuration
 DEFAULT_NBA_SEASON = int(os.getenv("DEFAULT_NBA_SEASON", "2025"))
 
+# JSON bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# /api/reports pagination
+REPORTS_DEFAULT_LIMIT = 50
+REPORTS_MAX_LIMIT = 500
+# Report lists at least this large are parsed incrementally (needs ijson)
+REPORTS_STREAM_MIN_BYTES = 64 * 1024
+
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=getattr(logging, LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Shared pool for overlapping independent upstream calls within a request
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='upstream')
+
+# Assembled /api/report_bdl payloads keyed by (team query, season)
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "60"))
+_REPORT_CACHE = TTLCache(ttl=REPORT_CACHE_TTL, maxsize=64)
+
+# Front-end page is static: read it once and serve it from memory
+_FULL_HTML_PATH = os.path.join(os.path.dirname(__file__), 'templates', 'full.html')
+
+
+def _load_full_html() -> bytes | None:
+    try:
+        with open(_FULL_HTML_PATH, 'rb') as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
 
-# Team mapping: UI slug -> Basketball-Reference abbreviation
-SLUG_TO_BR = {
+_FULL_HTML_BYTES = _load_full_html()
+_FULL_HTML_ETAG = f'"{hashlib.sha1(_FULL_HTML_BYTES).hexdigest()}"' if _FULL_HTML_BYTES is not None else None
+
+
+# Team mapping: UI slug -> Basketball-Reference abbreviation (read-only)
+SLUG_TO_BR = MappingProxyType({
     # Atlantic Division
     'celtics': 'BOS',
     'nets': 'BRK',
@@ -98,27 +149,93 @@ SLUG_TO_BR = {
     'grizzlies': 'MEM',
     'pelicans': 'NOP',
     'spurs': 'SAS',
-}
+})
+
+# Reverse mapping: Basketball-Reference abbreviation -> UI slug
+BR_TO_SLUG = MappingProxyType({abbr: slug for slug, abbr in SLUG_TO_BR.items()})
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return True if an Accept-Encoding header allows gzip."""
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() == 'gzip':
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+
+def _int_param(query: dict, name: str, default: int, minimum: int, maximum: int | None) -> int:
+    """Read an integer query parameter, falling back to default and clamping."""
+    try:
+        value = int(query.get(name, [default])[0])
+    except (TypeError, ValueError):
+        return default
+    value = max(value, minimum)
+    return min(value, maximum) if maximum is not None else value
 
 
 def _resolve_br_abbr(team_input: str) -> tuple[str, str]:
     """Normalize incoming team value to (slug, BR abbreviation).
 
     - If input is a known slug, map to BR abbr
-    - If input looks like a 3-letter abbr, use as-is uppercased
-    - Otherwise, best-effort uppercase fallback (may be invalid)
+    - If input is a known BR abbr (e.g., 'CHI'), map back to its slug
+    - Otherwise, best-effort lowercase/uppercase fallback (may be invalid)
     """
-    slug = team_input.lower().strip()
+    ti = team_input.strip()
+    slug = ti.lower()
     if slug in SLUG_TO_BR:
         return slug, SLUG_TO_BR[slug]
-    # Allow passing BR abbr directly (e.g., 'CHI')
-    ti = team_input.strip()
-    if len(ti) == 3 and ti.isalpha():
-        return ti.lower(), ti.upper()
-    return slug, ti.upper()
+    abbr = ti.upper()
+    if abbr in BR_TO_SLUG:
+        return BR_TO_SLUG[abbr], abbr
+    return slug, abbr
+
+
+def _build_report_bdl(team_query: str, season: int) -> dict | None:
+    """Fetch and assemble the BDL + odds payload; None if the team is unknown."""
+    # Lookup team in BDL
+    team = bdl_team_lookup(team_query)
+    if not team:
+        return None
+    team_id = team.get('id')
+    # Games, injuries and odds are independent; fetch them concurrently
+    f_games = _EXECUTOR.submit(bdl_games_by_team, team_id, season=season)
+    f_injuries = _EXECUTOR.submit(bdl_injuries_by_team, team_id)
+    f_odds = _EXECUTOR.submit(odds_current_odds)
+    games_resp = f_games.result()
+    games = games_resp.get('data', []) if isinstance(games_resp, dict) else []
+    injuries_resp = f_injuries.result()
+    injuries = injuries_resp.get('data', []) if isinstance(injuries_resp, dict) else []
+
+    # Odds: get current odds and filter for events including this team
+    try:
+        odds_events = f_odds.result()
+    except Exception:
+        odds_events = []
+    team_names = [team.get('full_name'), team.get('name'), team.get('abbreviation')]
+    odds_for_team = odds_find_for_matchup(odds_events, [t for t in team_names if t])
+
+    return {
+        'team': {
+            'id': team_id,
+            'name': team.get('full_name') or team.get('name'),
+            'abbreviation': team.get('abbreviation'),
+            'city': team.get('city'),
+            'division': team.get('division'),
+            'conference': team.get('conference'),
+        },
+        'season': season,
+        'games': games,
+        'injuries': injuries,
+        'odds': odds_for_team,
+    }
 
 
 class FullHandler(BaseHTTPRequestHandler):
+    # Buffer wfile so the header block and body of a response leave in a
+    # single send; the base handler flushes after each request.
+    wbufsize = -1
+
     def __init__(self, *args, **kwargs):
         """Allow no-arg construction in tests by setting minimal I/O fields.
 
@@ -133,9 +250,30 @@ class FullHandler(BaseHTTPRequestHandler):
             self.path = '/'
             return
         super().__init__(*args, **kwargs)
+
+    def _write_json(self, obj, status: int = 200, headers: dict | None = None) -> None:
+        """Serialize obj and send it as a complete JSON response.
+
+        Large bodies are gzip-compressed (level 1, cheap on CPU) when the
+        client sends Accept-Encoding: gzip. Extra `headers` are sent as-is.
+        """
+        body = _json_bytes(obj)
+        compress = len(body) >= GZIP_MIN_BYTES and _accepts_gzip(self.headers.get('Accept-Encoding'))
+        if compress:
+            body = gzip.compress(body, compresslevel=1)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self):
         # Parse path and query string separately
-        from urllib.parse import urlparse, parse_qs
         parsed = urlparse(self.path)
         path = unquote(parsed.path)
         query = parse_qs(parsed.query)
@@ -161,8 +299,6 @@ class FullHandler(BaseHTTPRequestHandler):
                 return
             self.handle_player_stats(game_id)
         elif path.startswith('/api/odds/scores'):
-            from urllib.parse import parse_qs
-            query = parse_qs(parsed.query)
             fixture_id = (query.get('fixtureId') or query.get('fixtureid') or [None])[0]
             if not fixture_id:
                 self.send_response(400)
@@ -170,8 +306,6 @@ class FullHandler(BaseHTTPRequestHandler):
                 return
             self.handle_scores(fixture_id)
         elif path.startswith('/report'):
-            from urllib.parse import parse_qs
-            query = parse_qs(parsed.query)
             team = (query.get('team') or [None])[0]
             if not team:
                 self.send_response(400)
@@ -180,8 +314,6 @@ class FullHandler(BaseHTTPRequestHandler):
             self.handle_report_simple(team)
         elif path.startswith('/api/report_bdl'):
             # expects /api/report_bdl?team=CHI (abbr or name)
-            from urllib.parse import parse_qs
-            query = parse_qs(parsed.query)
             team = (query.get('team') or [None])[0]
             if not team:
                 self.send_response(400)
@@ -195,28 +327,31 @@ class FullHandler(BaseHTTPRequestHandler):
             self.end_headers()
 
     def serve_full_page(self):
-        try:
-            tmpl_path = os.path.join(os.path.dirname(__file__), 'templates', 'full.html')
-            with open(tmpl_path, 'rb') as fh:
-                content = fh.read()
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(content)
-        except FileNotFoundError:
+        """Serve the cached front-end page; changes need a server restart."""
+        if _FULL_HTML_BYTES is None:
             self.send_response(500)
             self.end_headers()
             self.wfile.write(b'Full page not found.')
+            return
+        if self.headers.get('If-None-Match') == _FULL_HTML_ETAG:
+            self.send_response(304)
+            self.send_header('ETag', _FULL_HTML_ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(_FULL_HTML_BYTES)))
+        self.send_header('ETag', _FULL_HTML_ETAG)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(_FULL_HTML_BYTES)
 
     def handle_generate_report(self, team: str, save_flag: bool):
         # Deprecated legacy endpoint (scraping disabled). Direct callers to API-first.
-        self.send_response(410)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({
+        self._write_json({
             'error': 'deprecated',
             'message': 'Use /report?team= or /api/report_bdl?team= for API-first reports.'
-        }).encode('utf-8'))
+        }, status=410)
 
     def handle_list_reports(self, query):
         """Return stored reports filtered by query parameters.
@@ -225,22 +360,20 @@ class FullHandler(BaseHTTPRequestHandler):
           team: filter by team abbreviation
           from:  ISO date string (inclusive) - filter by created_at >= from
           to:    ISO date string (inclusive) - filter by created_at <= to
+          limit: page size, 1..REPORTS_MAX_LIMIT (default REPORTS_DEFAULT_LIMIT)
+          offset: number of newest reports to skip (default 0)
         """
         if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps([]).encode('utf-8'))
+            self._write_json([])
             return
         bearer = self.headers.get('Authorization')
         team_filter = query.get('team', [None])[0]
         date_from = query.get('from', [None])[0]
         date_to = query.get('to', [None])[0]
-        reports = fetch_reports(bearer, team_filter, date_from, date_to)
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(reports).encode('utf-8'))
+        limit = _int_param(query, 'limit', REPORTS_DEFAULT_LIMIT, 1, REPORTS_MAX_LIMIT)
+        offset = _int_param(query, 'offset', 0, 0, None)
+        reports = fetch_reports(bearer, team_filter, date_from, date_to, limit=limit, offset=offset)
+        self._write_json(reports)
 
     def handle_analysis(self, team: str):
         # API-first analysis: build a compatible report from BDL + injuries + historical odds
@@ -248,9 +381,7 @@ class FullHandler(BaseHTTPRequestHandler):
         # Resolve team via BDL
         team_obj = bdl_team_lookup(slug) or bdl_team_lookup(br)
         if not team_obj:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "team_not_found"}).encode('utf-8'))
+            self._write_json({"error": "team_not_found"}, status=404)
             return
         team_id = team_obj.get('id')
         season = DEFAULT_NBA_SEASON
@@ -327,18 +458,14 @@ class FullHandler(BaseHTTPRequestHandler):
             'injuries': injuries,
         }
         metrics = calculate_basic_metrics(report)
-        rates = calculate_ats_ou_rates(report)
-        suggestions = generate_parlay_suggestions(report)
+        rates, suggestions = summarize(report)
         analysis_data = {
             'team': slug,
             'metrics': metrics,
             'rates': rates,
             'parlay_suggestions': suggestions,
         }
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(analysis_data).encode('utf-8'))
+        self._write_json(analysis_data)
 
     def handle_refresh(self, team: str):
         """Manual refresh: run ETL to ingest odds history for a team."""
@@ -347,41 +474,29 @@ class FullHandler(BaseHTTPRequestHandler):
         try:
             from odds_etl import ingest_odds_for_team
             ingest_odds_for_team(br, days=30)
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self._write_json({
                 'status': 'refreshed',
                 'team': slug,
                 'message': 'Historical odds ingested for last 30 days.'
-            }).encode('utf-8'))
+            })
         except Exception as e:
             logger.error(f"Refresh error: {e}")
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self._write_json({
                 'error': 'refresh_failed',
                 'message': str(e)
-            }).encode('utf-8'))
+            }, status=500)
 
     def handle_player_stats(self, game_id: str):
         """Return per-player statistics for a game via API-NBA provider."""
         stats = get_player_statistics_api_nba(game_id)
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({
+        self._write_json({
             'game_id': game_id,
             'players': stats,
-        }).encode('utf-8'))
+        })
 
     def handle_scores(self, fixture_id: str):
         data = get_scores_rapid(fixture_id)
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self._write_json(data)
 
     def handle_report_simple(self, team_query: str):
         """API-first report using BDL (games, injuries) + The Odds API (odds).
@@ -397,53 +512,23 @@ class FullHandler(BaseHTTPRequestHandler):
             'injuries': injuries,
             'odds': odds,
         }
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(payload).encode('utf-8'))
+        self._write_json(payload)
 
     def handle_report_bdl(self, team_query: str):
-        """Compose report using BallDontLie + The Odds API."""
-        # Lookup team in BDL
-        team = bdl_team_lookup(team_query)
-        if not team:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "team_not_found"}).encode('utf-8'))
-            return
-        team_id = team.get('id')
-        season = DEFAULT_NBA_SEASON
-        games_resp = bdl_games_by_team(team_id, season=season)
-        games = games_resp.get('data', []) if isinstance(games_resp, dict) else []
-        injuries_resp = bdl_injuries_by_team(team_id)
-        injuries = injuries_resp.get('data', []) if isinstance(injuries_resp, dict) else []
-
-        # Odds: get current odds and filter for events including this team
-        try:
-            odds_events = odds_current_odds()
-        except Exception:
-            odds_events = []
-        team_names = [team.get('full_name'), team.get('name'), team.get('abbreviation')]
-        odds_for_team = odds_find_for_matchup(odds_events, [t for t in team_names if t])
+        """Compose report using BallDontLie + The Odds API.
 
-        payload = {
-            'team': {
-                'id': team_id,
-                'name': team.get('full_name') or team.get('name'),
-                'abbreviation': team.get('abbreviation'),
-                'city': team.get('city'),
-                'division': team.get('division'),
-                'conference': team.get('conference'),
-            },
-            'season': season,
-            'games': games,
-            'injuries': injuries,
-            'odds': odds_for_team,
-        }
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(payload).encode('utf-8'))
+        Assembled payloads are cached per (team, season) for REPORT_CACHE_TTL
+        seconds, so dashboard polling does not refetch everything upstream.
+        """
+        key = (team_query.strip().lower(), DEFAULT_NBA_SEASON)
+        payload = _REPORT_CACHE.get(key)
+        if payload is None:
+            payload = _build_report_bdl(team_query, DEFAULT_NBA_SEASON)
+            if payload is None:
+                self._write_json({"error": "team_not_found"}, status=404)
+                return
+            _REPORT_CACHE.set(key, payload)
+        self._write_json(payload, headers={'Cache-Control': 'public, max-age=30'})
 
     def log_message(self, format, *args):
         return
@@ -471,33 +556,35 @@ def save_report(team: str, data: dict, bearer_token: str | None) -> None:
         pass
 
 
-def fetch_reports(bearer_token: str | None, team: str | None = None, date_from: str | None = None, date_to: str | None = None) -> list:
-    """Retrieve reports from Supabase with optional filters.
+def fetch_reports(bearer_token: str | None, team: str | None = None, date_from: str | None = None, date_to: str | None = None,
+                  limit: int = REPORTS_DEFAULT_LIMIT, offset: int = 0) -> list:
+    """Retrieve reports from Supabase with optional filters, newest first.
 
     Args:
         bearer_token: JWT for user context (or None for service role).
         team: Filter by team name (lowercase slug).
         date_from: ISO date string to filter reports created on or after this date.
         date_to: ISO date string to filter reports created on or before this date.
+        limit: Maximum number of rows to return.
+        offset: Number of rows to skip (for paging).
 
     Returns:
         List of report rows (JSON objects).
     """
     if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
         return []
-    # Build query string with filters
-    filters = []
+    # Build query string with filters; ordering and paging run server-side
+    filters = ["select=*"]
     if team:
         filters.append(f"team=eq.{team}")
     if date_from:
         filters.append(f"created_at=gte.{date_from}")
     if date_to:
         filters.append(f"created_at=lte.{date_to}")
-    params = '&'.join(filters)
-    if params:
-        url = f"{SUPABASE_URL.rstrip('/')}/rest/v1/reports?select=*&{params}"
-    else:
-        url = f"{SUPABASE_URL.rstrip('/')}/rest/v1/reports?select=*"
+    filters.append("order=created_at.desc")
+    filters.append(f"limit={limit}")
+    filters.append(f"offset={offset}")
+    url = f"{SUPABASE_URL.rstrip('/')}/rest/v1/reports?{'&'.join(filters)}"
     headers = {
         'apikey': SUPABASE_SERVICE_KEY,
         'Authorization': f"Bearer {SUPABASE_SERVICE_KEY}",
@@ -505,13 +592,27 @@ def fetch_reports(bearer_token: str | None, team: str | None = None, date_from:
     if bearer_token:
         headers['Authorization'] = bearer_token
     try:
-        resp = requests.get(url, headers=headers, timeout=5)
-        resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.RequestException:
+        resp = requests.get(url, headers=headers, timeout=5, stream=ijson is not None)
+        try:
+            resp.raise_for_status()
+            if ijson is not None and _content_length(resp) >= REPORTS_STREAM_MIN_BYTES:
+                # Build rows straight from the socket instead of buffering the body first
+                resp.raw.decode_content = True
+                return list(ijson.items(resp.raw, 'item', use_float=True))
+            return resp.json()
+        finally:
+            resp.close()
+    except (requests.exceptions.RequestException, *_STREAM_JSON_ERRORS):
         return []
 
 
+def _content_length(resp) -> int:
+    try:
+        return int(resp.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return 0
+
+
 def run_server(host: str = None, port: int = None) -> None:
     host = host or SERVER_HOST
     port = port or SERVER_PORT
@@ -519,7 +620,8 @@ def run_server(host: str = None, port: int = None) -> None:
     logger.info(f"Starting NBA analysis server on {host}:{port}")
     logger.info(f"Supabase configured: {bool(SUPABASE_URL and SUPABASE_SERVICE_KEY)}")
     
-    with HTTPServer((host, port), FullHandler) as httpd:
+    # One thread per request so slow upstream calls don't block other clients
+    with ThreadingHTTPServer((host, port), FullHandler) as httpd:
         logger.info(f"Serving NBA full app on http://{host}:{port}")
         try:
             httpd.serve_forever()
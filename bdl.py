@@ -1,7 +1,9 @@
 import os
 from typing import Any, Dict, Optional
 from dotenv import load_dotenv
-from clients import get_client, fetch
+from cache import TTLCache
+import httpx
+from clients import get_client, fetch, afetch
 
 load_dotenv()
 
@@ -9,6 +11,14 @@ BASE = "https://api.balldontlie.io/v1"
 KEY = os.getenv("BALLDONTLIE_API_KEY")
 HEAD = {"Authorization": KEY} if KEY else None
 
+# Teams are static for a season; keep successful lookups for a day
+_TEAM_CACHE = TTLCache(ttl=86400, maxsize=256)
+
+# Set after the injuries endpoint answers 401/403 (e.g. free tier) so later
+# calls skip a request that cannot succeed. BDL_INJURIES_DISABLED=1 starts
+# the process with the endpoint already skipped.
+_INJ_BLOCKED = os.getenv("BDL_INJURIES_DISABLED", "0").strip().lower() in {"1", "true", "yes", "on"}
+
 
 def team_lookup(slug_or_abbr: str) -> Optional[Dict[str, Any]]:
     """Robust team lookup by slug or abbreviation.
@@ -17,12 +27,36 @@ def team_lookup(slug_or_abbr: str) -> Optional[Dict[str, Any]]:
     may return "Chicago Bulls" first, which is incorrect for Charlotte.
     We prefer exact abbreviation match when the input is 3 letters; otherwise
     try exact name/full_name match; finally fall back to the first result.
+
+    Found teams are cached in-process, so repeated lookups skip the network.
     """
     q = (slug_or_abbr or "").strip()
     if not q:
         return None
-    c = get_client()
-    data = fetch(c, f"{BASE}/teams", params={"search": q}, headers=HEAD)
+    key = q.lower()
+    team = _TEAM_CACHE.get(key)
+    if team is None:
+        team = _pick_team(q, fetch(get_client(), f"{BASE}/teams", params={"search": q}, headers=HEAD))
+        if team is not None:
+            _TEAM_CACHE.set(key, team)
+    return team
+
+
+async def team_lookup_async(c: httpx.AsyncClient, slug_or_abbr: str) -> Optional[Dict[str, Any]]:
+    """Async team_lookup(); shares the same matching rules and cache."""
+    q = (slug_or_abbr or "").strip()
+    if not q:
+        return None
+    key = q.lower()
+    team = _TEAM_CACHE.get(key)
+    if team is None:
+        team = _pick_team(q, await afetch(c, f"{BASE}/teams", params={"search": q}, headers=HEAD))
+        if team is not None:
+            _TEAM_CACHE.set(key, team)
+    return team
+
+
+def _pick_team(q: str, data: Any) -> Optional[Dict[str, Any]]:
     items = data.get("data", []) if isinstance(data, dict) else []
     if not items:
         return None
@@ -42,12 +76,22 @@ def team_lookup(slug_or_abbr: str) -> Optional[Dict[str, Any]]:
     return items[0]
 
 
-def games_by_team(team_id: int, season: Optional[int] = None, per_page: int = 25) -> Dict[str, Any]:
-    c = get_client()
+def _games_params(team_id: int, season: Optional[int], per_page: int) -> Dict[str, Any]:
     params: Dict[str, Any] = {"team_ids[]": team_id, "per_page": per_page}
     if season:
         params["seasons[]"] = season
-    return fetch(c, f"{BASE}/games", params=params, headers=HEAD)
+    return params
+
+
+def games_by_team(team_id: int, season: Optional[int] = None, per_page: int = 25) -> Dict[str, Any]:
+    c = get_client()
+    return fetch(c, f"{BASE}/games", params=_games_params(team_id, season, per_page), headers=HEAD)
+
+
+async def games_by_team_async(
+    c: httpx.AsyncClient, team_id: int, season: Optional[int] = None, per_page: int = 25
+) -> Dict[str, Any]:
+    return await afetch(c, f"{BASE}/games", params=_games_params(team_id, season, per_page), headers=HEAD)
 
 
 def boxscore(game_id: int) -> Dict[str, Any]:
@@ -55,10 +99,29 @@ def boxscore(game_id: int) -> Dict[str, Any]:
     return fetch(c, f"{BASE}/stats", params={"game_ids[]": game_id, "per_page": 100}, headers=HEAD)
 
 
+def _injuries_failed(e: Exception) -> Dict[str, Any]:
+    global _INJ_BLOCKED
+    # Return empty injuries if endpoint is not accessible (401 or other errors)
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    if status in (401, 403):
+        _INJ_BLOCKED = True
+    return {"data": []}
+
+
 def injuries_by_team(team_id: int, per_page: int = 100) -> Dict[str, Any]:
+    if _INJ_BLOCKED:
+        return {"data": []}
     c = get_client()
     try:
         return fetch(c, f"{BASE}/player_injuries", params={"team_ids[]": team_id, "per_page": per_page}, headers=HEAD)
-    except Exception:
-        # Return empty injuries if endpoint is not accessible (401 or other errors)
+    except Exception as e:
+        return _injuries_failed(e)
+
+
+async def injuries_by_team_async(c: httpx.AsyncClient, team_id: int, per_page: int = 100) -> Dict[str, Any]:
+    if _INJ_BLOCKED:
         return {"data": []}
+    try:
+        return await afetch(c, f"{BASE}/player_injuries", params={"team_ids[]": team_id, "per_page": per_page}, headers=HEAD)
+    except Exception as e:
+        return _injuries_failed(e)
@@ -0,0 +1,45 @@
+"""
+Small in-process TTL cache used to memoize upstream API responses.
+
+Values are kept per process only; restarting the server or scheduler starts
+with an empty cache.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire `ttl` seconds after insertion.
+
+    When `maxsize` entries are stored, the oldest one is evicted first.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            if now - item[0] >= self.ttl:
+                del self._data[key]
+                return default
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # dicts keep insertion order, so the first key is the oldest
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic(), value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
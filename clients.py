@@ -1,18 +1,41 @@
+import asyncio
+import atexit
 import random
+import threading
 import time
 import httpx
 from typing import Any, Dict, Optional
 
+try:
+    import h2  # noqa: F401  (needed by httpx for HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; stdlib json is the slower fallback
+    from json import loads as _loads
+
 UAS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118 Safari/537.36",
 ]
 
 
-def get_client() -> httpx.Client:
-    return httpx.Client(
-        http2=False,
-        timeout=20.0,
+_CLIENT: Optional[httpx.Client] = None
+_LOCK = threading.Lock()
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return dict(
+        http2=_HTTP2,
+        timeout=httpx.Timeout(20.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=60,
+        ),
         follow_redirects=True,
         headers={
             "User-Agent": random.choice(UAS),
@@ -22,6 +45,87 @@ def get_client() -> httpx.Client:
     )
 
 
+def get_client() -> httpx.Client:
+    """Return the shared, lazily created HTTP client.
+
+    A single pooled client keeps connections alive between calls, so the
+    BDL/Odds requests behind one report reuse TCP+TLS sessions instead of
+    paying a new handshake each time. With HTTP/2 (when `h2` is installed)
+    concurrent requests to the same host multiplex over one connection.
+    httpx.Client is safe to share across threads.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        with _LOCK:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(**_client_kwargs())
+                atexit.register(_CLIENT.close)
+    return _CLIENT
+
+
+def make_async_client() -> httpx.AsyncClient:
+    """Build an AsyncClient with the same settings as get_client().
+
+    Async clients are bound to the event loop they are used on, so callers
+    own the instance (use it as `async with make_async_client() as c:`).
+    """
+    return httpx.AsyncClient(**_client_kwargs())
+
+
+# Per-thread RNG for retry jitter, so concurrent retries don't share the
+# module-level random state
+_RNG = threading.local()
+
+
+def _jitter() -> float:
+    """Return a backoff multiplier in [0.7, 1.3)."""
+    rng = getattr(_RNG, "rng", None)
+    if rng is None:
+        rng = _RNG.rng = random.Random()
+    return 0.7 + rng.random() * 0.6
+
+
+# Per-host monotonic time before which no new request is sent. Only set after
+# a 429, so the happy path never waits.
+_HOST_READY_AT: Dict[str, float] = {}
+_HOST_LOCK = threading.Lock()
+
+
+def _host_delay(host: str) -> float:
+    with _HOST_LOCK:
+        ready_at = _HOST_READY_AT.get(host, 0.0)
+    return ready_at - time.monotonic()
+
+
+def _defer_host(host: str, wait: float) -> None:
+    with _HOST_LOCK:
+        ready_at = time.monotonic() + wait
+        _HOST_READY_AT[host] = max(_HOST_READY_AT.get(host, 0.0), ready_at)
+
+
+def _retry_delay(e: httpx.HTTPError, attempt: int, tries: int, base: float, host: str) -> Optional[float]:
+    """Return seconds to sleep before the next attempt, or None to give up."""
+    if isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+        # Don't retry on 401/403 - auth or plan errors won't succeed
+        if status in (401, 403):
+            return None
+        # Handle rate limiting: respect Retry-After when 429
+        if status == 429:
+            if attempt == tries:
+                return None
+            ra = e.response.headers.get("Retry-After")
+            try:
+                wait = float(ra)
+            except (TypeError, ValueError):
+                wait = base * (2 ** (attempt - 1))
+            _defer_host(host, wait)
+            return 0.0
+    if attempt == tries:
+        return None
+    return base * (2 ** (attempt - 1)) * _jitter()
+
+
 def fetch(
     c: httpx.Client,
     url: str,
@@ -30,31 +134,47 @@ def fetch(
     tries: int = 5,
     base: float = 1.2,
 ) -> Any:
-    """GET JSON with retry and jittered backoff."""
+    """GET JSON with retry and jittered backoff.
+
+    A 429 puts the whole host on hold (honouring Retry-After), so concurrent
+    callers back off together instead of hammering a rate-limited API.
+    """
+    host = httpx.URL(url).host
     for i in range(1, tries + 1):
+        delay = _host_delay(host)
+        if delay > 0:
+            time.sleep(delay)
         try:
             r = c.get(url, params=params, headers=headers)
             r.raise_for_status()
-            # gentle throttle
-            time.sleep(0.4 + random.random() * 0.6)
-            return r.json()
-        except httpx.HTTPStatusError as e:
-            # Don't retry on 401 Unauthorized - it won't succeed
-            if e.response.status_code == 401:
-                raise
-            # Handle rate limiting: respect Retry-After when 429
-            if e.response.status_code == 429:
-                ra = e.response.headers.get("Retry-After")
-                try:
-                    wait = float(ra)
-                except (TypeError, ValueError):
-                    wait = base * (2 ** (i - 1))
-                time.sleep(wait)
-                continue
-            if i == tries:
+            return _loads(r.content)
+        except httpx.HTTPError as e:
+            delay = _retry_delay(e, i, tries, base, host)
+            if delay is None:
                 raise
-            time.sleep(base * (2 ** (i - 1)) * (0.7 + random.random() * 0.6))
-        except httpx.HTTPError:
-            if i == tries:
+            time.sleep(delay)
+
+
+async def afetch(
+    c: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    tries: int = 5,
+    base: float = 1.2,
+) -> Any:
+    """Async counterpart of fetch() with the same retry and 429 policy."""
+    host = httpx.URL(url).host
+    for i in range(1, tries + 1):
+        delay = _host_delay(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            r = await c.get(url, params=params, headers=headers)
+            r.raise_for_status()
+            return _loads(r.content)
+        except httpx.HTTPError as e:
+            delay = _retry_delay(e, i, tries, base, host)
+            if delay is None:
                 raise
-            time.sleep(base * (2 ** (i - 1)) * (0.7 + random.random() * 0.6))
+            await asyncio.sleep(delay)
@@ -6,10 +6,9 @@ Usage examples:
   python etl_bdl.py --teams CHI,BOS,LAL --season 2025
 """
 import argparse
-import hashlib
-import json
 import os
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -65,16 +64,20 @@ def _as_injury_rows(injuries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 def _event_id(ev: Dict[str, Any]) -> str:
-    # Prefer id from API; else derive a stable hash from teams + commence_time
+    # The Odds API sends an id on every event; the hash is only a fallback
     ev_id = ev.get("id")
-    if ev_id:
-        return str(ev_id)
-    basis = json.dumps({
-        "home": ev.get("home_team"),
-        "away": ev.get("away_team"),
-        "t": ev.get("commence_time"),
-    }, sort_keys=True)
-    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+    return str(ev_id) if ev_id else _event_id_hash_fallback(ev)
+
+
+def _event_id_hash_fallback(ev: Dict[str, Any]) -> str:
+    """Stable id from teams + commence_time for events without an API id.
+
+    Only used for dedup, so a fast 128-bit BLAKE2 digest is plenty.
+    """
+    import hashlib
+
+    basis = f"{ev.get('home_team')}|{ev.get('away_team')}|{ev.get('commence_time')}"
+    return hashlib.blake2b(basis.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def _as_odds_rows(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -94,28 +97,110 @@ def _as_odds_rows(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return rows
 
 
-def run_for_team(team_query: str, season: int) -> None:
+def _current_odds_or_empty() -> List[Dict[str, Any]]:
+    try:
+        return current_odds()
+    except Exception:
+        return []
+
+
+# (team_rows, game_rows, injury_rows, odds_rows)
+TeamRows = Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def build_team_rows(
+    team: Dict[str, Any],
+    games: List[Dict[str, Any]],
+    injuries: List[Dict[str, Any]],
+    selected_odds: List[Dict[str, Any]],
+) -> TeamRows:
+    return (
+        [_as_team_row(team)],
+        _as_game_rows(games),
+        _as_injury_rows(injuries),
+        _as_odds_rows(selected_odds),
+    )
+
+
+def team_odds_names(team: Dict[str, Any]) -> List[str]:
+    names = [team.get("full_name"), team.get("name"), team.get("abbreviation"), team.get("city")]
+    return [n for n in names if n]
+
+
+def run_for_team(team_query: str, season: int, events: Optional[List[Dict[str, Any]]] = None) -> Optional[TeamRows]:
+    """Fetch one team's rows without writing them; None if the team is unknown.
+
+    Pass `events` to reuse league-wide odds across teams.
+    """
     team = team_lookup(team_query)
     if not team:
         print(f"Team not found: {team_query}")
-        return
-    insert_teams([_as_team_row(team)])
-
+        return None
     games = (games_by_team(team.get("id"), season=season) or {}).get("data", [])
-    insert_games(_as_game_rows(games))
-
     injuries = (injuries_by_team(team.get("id")) or {}).get("data", [])
+    if events is None:
+        events = _current_odds_or_empty()
+    selected = find_odds_for_matchup(events, team_odds_names(team))
+    return build_team_rows(team, games, injuries, selected)
+
+
+def _dedupe_by_id(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # A game or odds event shows up once per team playing in it; PostgREST
+    # rejects an upsert that touches the same key twice
+    by_id = {}
+    for row in rows:
+        by_id.setdefault(row.get("id"), row)
+    return list(by_id.values())
+
+
+def merge_team_rows(batches: Iterable[Optional[TeamRows]]) -> TeamRows:
+    """Combine per-team rows into one list per table, ready for a single upsert."""
+    teams: List[Dict[str, Any]] = []
+    games: List[Dict[str, Any]] = []
+    injuries: List[Dict[str, Any]] = []
+    odds: List[Dict[str, Any]] = []
+    for batch in batches:
+        if not batch:
+            continue
+        teams.extend(batch[0])
+        games.extend(batch[1])
+        injuries.extend(batch[2])
+        odds.extend(batch[3])
+    return _dedupe_by_id(teams), _dedupe_by_id(games), injuries, _dedupe_by_id(odds)
+
+
+def insert_team_rows(rows: TeamRows) -> None:
+    teams, games, injuries, odds = rows
+    if teams:
+        insert_teams(teams)
+    if games:
+        insert_games(games)
     if injuries:
-        insert_injuries(_as_injury_rows(injuries))
+        insert_injuries(injuries)
+    if odds:
+        insert_odds(odds)
 
+
+def _run_for_team_safe(team_query: str, season: int, events: List[Dict[str, Any]]) -> Optional[TeamRows]:
     try:
-        events = current_odds()
-    except Exception:
-        events = []
-    names = [team.get("full_name"), team.get("name"), team.get("abbreviation"), team.get("city")]
-    selected = find_odds_for_matchup(events, [n for n in names if n])
-    if selected:
-        insert_odds(_as_odds_rows(selected))
+        return run_for_team(team_query, season=season, events=events)
+    except Exception as e:
+        print(f"Failed to load {team_query}: {e}")
+        return None
+
+
+def fetch_teams(
+    teams: List[str], season: int, events: List[Dict[str, Any]], max_workers: int = 8
+) -> List[Optional[TeamRows]]:
+    """Run run_for_team() for each team on a thread pool, in input order.
+
+    The work is network-bound (the shared httpx client releases the GIL while
+    waiting), so threads overlap the per-team BDL round-trips.
+    """
+    if len(teams) <= 1:
+        return [_run_for_team_safe(t, season, events) for t in teams]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(teams)), thread_name_prefix="etl") as ex:
+        return list(ex.map(lambda t: _run_for_team_safe(t, season, events), teams))
 
 
 def main():
@@ -135,8 +220,10 @@ def main():
         print("Provide --team or --teams")
         return
 
-    for t in teams:
-        run_for_team(t, season=args.season)
+    # Odds are league-wide, so one fetch serves every team in the run
+    events = _current_odds_or_empty()
+    batches = fetch_teams(teams, args.season, events)
+    insert_team_rows(merge_team_rows(batches))
 
 
 if __name__ == "__main__":
@@ -7,10 +7,17 @@ import logging
 import os
 import random
 from typing import Any
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; stdlib json is the slower fallback
+    from json import loads as _loads
+
 # Load environment variables
 load_dotenv()
 
@@ -35,28 +42,65 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edg/125.0.0.0 Chrome/125.0.0.0 Safari/537.36",
 ]
 
-# Scraping configuration from environment variables
-SCRAPING_RATE_LIMIT_CALLS = int(os.getenv("SCRAPING_RATE_LIMIT_CALLS", "5"))
-SCRAPING_RATE_LIMIT_PERIOD = int(os.getenv("SCRAPING_RATE_LIMIT_PERIOD", "60"))
-SCRAPING_MAX_RETRIES = int(os.getenv("SCRAPING_MAX_RETRIES", "3"))
-SCRAPING_BACKOFF_FACTOR = float(os.getenv("SCRAPING_BACKOFF_FACTOR", "1.0"))
-SCRAPING_TIMEOUT = int(os.getenv("SCRAPING_TIMEOUT", "15"))
+def _make_adapter() -> HTTPAdapter:
+    # Retries (exponential backoff, Retry-After) happen in urllib3 rather
+    # than in Python-level loops around each call
+    retry = Retry(
+        total=SCRAPING_MAX_RETRIES,
+        backoff_factor=SCRAPING_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+    )
+    return HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+
+
+# Pooled session for the RapidAPI helpers; repeated per-game calls reuse the
+# TLS connection. The retrying adapter is mounted by reload_config().
+_SESSION = requests.Session()
 
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=getattr(logging, LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
-"""
-API-first routing flags
 
-These env-driven switches allow replacing legacy scraping with API sources
-without refactoring the existing callers. Defaults mirror legacy behavior.
-"""
-# Data source routing flags
-DATA_SRC_GAMES = os.getenv("DATA_SOURCE_GAMES", "br").lower()
-DATA_SRC_INJ = os.getenv("DATA_SOURCE_INJURIES", "pdf").lower()
-DATA_SRC_ODDS = os.getenv("DATA_SOURCE_ODDS", "scrape").lower()
+def reload_config() -> None:
+    """Read every env-driven setting of this module.
+
+    Runs once at import so hot paths use plain module constants instead of
+    os.getenv() per call; call it again after changing the environment.
+
+    Scraping configuration: SCRAPING_RATE_LIMIT_CALLS, SCRAPING_RATE_LIMIT_PERIOD,
+    SCRAPING_MAX_RETRIES, SCRAPING_BACKOFF_FACTOR, SCRAPING_TIMEOUT.
+
+    API-first routing flags: DATA_SRC_GAMES, DATA_SRC_INJ, DATA_SRC_ODDS let
+    API sources replace legacy scraping without refactoring the callers.
+
+    RapidAPI credentials: RAPIDAPI_KEY, RAPIDAPI_HOST, ODDS_RAPIDAPI_HOST,
+    ODDS_RAPIDAPI_KEY.
+    """
+    global SCRAPING_RATE_LIMIT_CALLS, SCRAPING_RATE_LIMIT_PERIOD, SCRAPING_MAX_RETRIES
+    global SCRAPING_BACKOFF_FACTOR, SCRAPING_TIMEOUT
+    global DATA_SRC_GAMES, DATA_SRC_INJ, DATA_SRC_ODDS, DEFAULT_NBA_SEASON
+    global RAPIDAPI_KEY, RAPIDAPI_HOST, ODDS_RAPIDAPI_HOST, ODDS_RAPIDAPI_KEY
+    SCRAPING_RATE_LIMIT_CALLS = int(os.getenv("SCRAPING_RATE_LIMIT_CALLS", "5"))
+    SCRAPING_RATE_LIMIT_PERIOD = int(os.getenv("SCRAPING_RATE_LIMIT_PERIOD", "60"))
+    SCRAPING_MAX_RETRIES = int(os.getenv("SCRAPING_MAX_RETRIES", "3"))
+    SCRAPING_BACKOFF_FACTOR = float(os.getenv("SCRAPING_BACKOFF_FACTOR", "1.0"))
+    SCRAPING_TIMEOUT = int(os.getenv("SCRAPING_TIMEOUT", "15"))
+    DATA_SRC_GAMES = os.getenv("DATA_SOURCE_GAMES", "bdl").lower()
+    DATA_SRC_INJ = os.getenv("DATA_SOURCE_INJURIES", "bdl").lower()
+    DATA_SRC_ODDS = os.getenv("DATA_SOURCE_ODDS", "the_odds_api").lower()
+    DEFAULT_NBA_SEASON = int(os.getenv("DEFAULT_NBA_SEASON", "2025"))
+    RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
+    RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST", "api-nba-v1.p.rapidapi.com")
+    ODDS_RAPIDAPI_HOST = os.getenv("ODDS_RAPIDAPI_HOST")
+    ODDS_RAPIDAPI_KEY = os.getenv("ODDS_RAPIDAPI_KEY")
+    # Retry settings live in the adapter, so rebuild it
+    _SESSION.mount("https://", _make_adapter())
+
+
+reload_config()
 
 # API clients (strict import – fail fast if missing)
 from bdl import team_lookup as bdl_team_lookup, games_by_team as bdl_games_by_team, injuries_by_team as bdl_injuries_by_team
@@ -73,17 +117,16 @@ def _bdl_resolve_team(q: str) -> Dict[str, Any]:
 
 def get_team_games(team_abbr_or_name: str, limit: int = 25) -> List[Dict[str, Any]]:
     """Return team games via BallDontLie only. Legacy scraping disabled."""
-    if os.getenv("DATA_SOURCE_GAMES", "bdl").lower() != "bdl":
+    if DATA_SRC_GAMES != "bdl":
         raise RuntimeError("Legacy BR scraping disabled")
     team = _bdl_resolve_team(team_abbr_or_name)
-    season = int(os.getenv("DEFAULT_NBA_SEASON", "2025"))
-    data = bdl_games_by_team(team.get("id"), season=season, per_page=limit)
+    data = bdl_games_by_team(team.get("id"), season=DEFAULT_NBA_SEASON, per_page=limit)
     return (data or {}).get("data", [])
 
 
 def get_team_injuries(team_abbr_or_name: str) -> List[Dict[str, Any]]:
     """Return team injuries via BallDontLie only. Legacy NBA PDF disabled."""
-    if os.getenv("DATA_SOURCE_INJURIES", "bdl").lower() != "bdl":
+    if DATA_SRC_INJ != "bdl":
         raise RuntimeError("Legacy NBA PDF injuries disabled")
     team = _bdl_resolve_team(team_abbr_or_name)
     data = bdl_injuries_by_team(team.get("id"))
@@ -92,7 +135,7 @@ def get_team_injuries(team_abbr_or_name: str) -> List[Dict[str, Any]]:
 
 def get_odds_for_games() -> List[Dict[str, Any]]:
     """Return odds from The Odds API only when enabled; else []."""
-    if os.getenv("DATA_SOURCE_ODDS", "the_odds_api").lower() != "the_odds_api":
+    if DATA_SRC_ODDS != "the_odds_api":
         return []
     data = odds_current_odds()
     return data if isinstance(data, list) else []
@@ -143,6 +186,44 @@ def _safe_int(val: Any) -> Optional[int]:
     except Exception:
         return None
 
+# Integer stat columns, in the order _stat_values() returns their raw values
+_STAT_FIELDS = (
+    "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+    "fgm", "fga", "tpm", "tpa", "ftm", "fta", "plus_minus",
+)
+
+
+def _stat_values(stats: Dict[str, Any]) -> Tuple[Any, ...]:
+    get = stats.get
+    return (
+        get("points"),
+        get("totReb") or get("rebounds"),
+        get("assists"),
+        get("steals"),
+        get("blocks"),
+        get("turnovers"),
+        get("fgm"),
+        get("fga"),
+        get("tpm") or get("threePointsMade"),
+        get("tpa") or get("threePointsAttempted"),
+        get("ftm"),
+        get("fta"),
+        get("plusMinus") or get("plusminus"),
+    )
+
+
+def _stat_ints(values: Tuple[Any, ...]) -> List[Optional[int]]:
+    """Cast raw stat values like _safe_int, with one exception guard per row.
+
+    Complete rows take the fast path; only a row with a missing or malformed
+    value pays for the per-field _safe_int fallback.
+    """
+    try:
+        return [int(v) for v in values]
+    except (TypeError, ValueError):
+        return [_safe_int(v) for v in values]
+
+
 def get_player_statistics_api_nba(game_id: str | int) -> List[Dict[str, Any]]:
     """Fetch per-player statistics for a specific game using API-NBA via RapidAPI.
 
@@ -152,8 +233,8 @@ def get_player_statistics_api_nba(game_id: str | int) -> List[Dict[str, Any]]:
     Returns:
         A list of player stat dicts with normalized keys when possible.
     """
-    key = os.getenv("RAPIDAPI_KEY")
-    host = os.getenv("RAPIDAPI_HOST", "api-nba-v1.p.rapidapi.com")
+    key = RAPIDAPI_KEY
+    host = RAPIDAPI_HOST
     if not key:
         logger.error("RAPIDAPI_KEY not set; cannot use API-NBA player stats")
         return []
@@ -166,53 +247,32 @@ def get_player_statistics_api_nba(game_id: str | int) -> List[Dict[str, Any]]:
     url = f"https://{host}/players/statistics"
     params = {"game": str(game_id)}
 
-    max_retries = SCRAPING_MAX_RETRIES
-    backoff = SCRAPING_BACKOFF_FACTOR
-    for attempt in range(max_retries + 1):
-        try:
-            resp = requests.get(url, headers=headers, params=params, timeout=SCRAPING_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-            items = data.get("response") or []
-            normalized: List[Dict[str, Any]] = []
-            for it in items:
-                player = it.get("player") or {}
-                team = it.get("team") or {}
-                stats = it.get("statistics") or it  # some responses embed stats at top-level
-                # Normalize key fields if present
-                full_name = (
-                    (player.get("firstname") or "").strip() + " " + (player.get("lastname") or "").strip()
-                ).strip() or player.get("name") or ""
-                norm = {
-                    "player_id": player.get("id"),
-                    "player": full_name,
-                    "team": team.get("code") or team.get("name") or team.get("nickname"),
-                    "minutes": stats.get("min") or stats.get("minutes"),
-                    "points": _safe_int(stats.get("points")),
-                    "rebounds": _safe_int(stats.get("totReb") or stats.get("rebounds")),
-                    "assists": _safe_int(stats.get("assists")),
-                    "steals": _safe_int(stats.get("steals")),
-                    "blocks": _safe_int(stats.get("blocks")),
-                    "turnovers": _safe_int(stats.get("turnovers")),
-                    "fgm": _safe_int(stats.get("fgm")),
-                    "fga": _safe_int(stats.get("fga")),
-                    "tpm": _safe_int(stats.get("tpm") or stats.get("threePointsMade")),
-                    "tpa": _safe_int(stats.get("tpa") or stats.get("threePointsAttempted")),
-                    "ftm": _safe_int(stats.get("ftm")),
-                    "fta": _safe_int(stats.get("fta")),
-                    "plus_minus": _safe_int(stats.get("plusMinus") or stats.get("plusminus")),
-                }
-                normalized.append(norm)
-            return normalized
-        except requests.exceptions.RequestException as e:
-            if attempt >= max_retries:
-                logger.error(f"API-NBA player stats failed for game {game_id}: {e}")
-                return []
-            sleep_time = (backoff ** attempt) + random.uniform(0, 0.5)
-            logger.warning(
-                f"API-NBA player stats error (attempt {attempt+1}/{max_retries+1}) for game {game_id}: {e}. Retrying in {sleep_time:.2f}s"
-            )
-            time.sleep(sleep_time)
+    try:
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=SCRAPING_TIMEOUT)
+        resp.raise_for_status()
+        data = _loads(resp.content)
+        items = data.get("response") or []
+        normalized: List[Dict[str, Any]] = []
+        for it in items:
+            player = it.get("player") or {}
+            team = it.get("team") or {}
+            stats = it.get("statistics") or it  # some responses embed stats at top-level
+            # Normalize key fields if present
+            full_name = (
+                (player.get("firstname") or "").strip() + " " + (player.get("lastname") or "").strip()
+            ).strip() or player.get("name") or ""
+            norm = {
+                "player_id": player.get("id"),
+                "player": full_name,
+                "team": team.get("code") or team.get("name") or team.get("nickname"),
+                "minutes": stats.get("min") or stats.get("minutes"),
+            }
+            norm.update(zip(_STAT_FIELDS, _stat_ints(_stat_values(stats))))
+            normalized.append(norm)
+        return normalized
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"API-NBA player stats failed for game {game_id}: {e}")
+        return []
 
 
 def get_scores_rapid(fixture_id: str) -> Dict[str, Any]:
@@ -223,8 +283,8 @@ def get_scores_rapid(fixture_id: str) -> Dict[str, Any]:
     - ODDS_RAPIDAPI_KEY
     """
 
-    host = os.getenv("ODDS_RAPIDAPI_HOST")
-    key = os.getenv("ODDS_RAPIDAPI_KEY")
+    host = ODDS_RAPIDAPI_HOST
+    key = ODDS_RAPIDAPI_KEY
     if not host or not key:
         logger.error("ODDS_RAPIDAPI_HOST/KEY not set; cannot fetch RapidAPI odds scores")
         return {}
@@ -236,39 +296,30 @@ def get_scores_rapid(fixture_id: str) -> Dict[str, Any]:
     }
     params = {"fixtureId": fixture_id}
 
-    max_retries = SCRAPING_MAX_RETRIES
-    backoff = SCRAPING_BACKOFF_FACTOR
-    for attempt in range(max_retries + 1):
-        try:
-            resp = requests.get(url, headers=headers, params=params, timeout=SCRAPING_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-            # Try common shapes: { response: {...} } or list
-            payload = data.get("response") if isinstance(data, dict) else data
-            if isinstance(payload, list) and payload:
-                payload = payload[0]
-            if not isinstance(payload, dict):
-                return {"fixtureId": fixture_id, "raw": data}
-            # Normalize some likely fields if present
-            norm = {
-                "fixtureId": fixture_id,
-                "home": payload.get("home") or (payload.get("teams", {}) or {}).get("home"),
-                "away": payload.get("away") or (payload.get("teams", {}) or {}).get("away"),
-                "home_score": payload.get("home_score") or (payload.get("scores", {}) or {}).get("home"),
-                "away_score": payload.get("away_score") or (payload.get("scores", {}) or {}).get("away"),
-                "status": payload.get("status") or (payload.get("game", {}) or {}).get("status"),
-                "date": payload.get("date") or (payload.get("game", {}) or {}).get("date"),
-            }
-            return norm
-        except requests.exceptions.RequestException as e:
-            if attempt >= max_retries:
-                logger.error(f"RapidAPI scores failed for fixture {fixture_id}: {e}")
-                return {"fixtureId": fixture_id, "error": str(e)}
-            sleep_time = (backoff ** attempt) + random.uniform(0, 0.5)
-            logger.warning(
-                f"RapidAPI scores error (attempt {attempt+1}/{max_retries+1}) for fixture {fixture_id}: {e}. Retrying in {sleep_time:.2f}s"
-            )
-            time.sleep(sleep_time)
+    try:
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=SCRAPING_TIMEOUT)
+        resp.raise_for_status()
+        data = _loads(resp.content)
+        # Try common shapes: { response: {...} } or list
+        payload = data.get("response") if isinstance(data, dict) else data
+        if isinstance(payload, list) and payload:
+            payload = payload[0]
+        if not isinstance(payload, dict):
+            return {"fixtureId": fixture_id, "raw": data}
+        # Normalize some likely fields if present
+        norm = {
+            "fixtureId": fixture_id,
+            "home": payload.get("home") or (payload.get("teams", {}) or {}).get("home"),
+            "away": payload.get("away") or (payload.get("teams", {}) or {}).get("away"),
+            "home_score": payload.get("home_score") or (payload.get("scores", {}) or {}).get("home"),
+            "away_score": payload.get("away_score") or (payload.get("scores", {}) or {}).get("away"),
+            "status": payload.get("status") or (payload.get("game", {}) or {}).get("status"),
+            "date": payload.get("date") or (payload.get("game", {}) or {}).get("date"),
+        }
+        return norm
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"RapidAPI scores failed for fixture {fixture_id}: {e}")
+        return {"fixtureId": fixture_id, "error": str(e)}
 
 
 def get_closing_lines(*args, **kwargs) -> List[Dict[str, str]]:
@@ -1,7 +1,11 @@
 import os
-from typing import Any, Dict, List
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from clients import get_client, fetch
+from cache import TTLCache
+import httpx
+from clients import get_client, fetch, afetch
 
 load_dotenv()
 
@@ -9,32 +13,128 @@ BASE = "https://api.the-odds-api.com/v4/sports/basketball_nba/odds"
 KEY = os.getenv("ODDS_API_KEY")
 REGIONS = os.getenv("ODDS_REGIONS", "eu,us")
 MARKETS = os.getenv("ODDS_MARKETS", "h2h,spreads,totals")
+CACHE_TTL = float(os.getenv("ODDS_CACHE_TTL", "60"))
+
+# Lines move every few minutes; share one fetch across callers within the TTL
+_ODDS_CACHE = TTLCache(ttl=CACHE_TTL, maxsize=8)
+_ODDS_LOCK = threading.Lock()
+
+# Optional on-disk cache shared by separate processes (cron runs, several
+# workers). Enabled by pointing ODDS_DISK_CACHE_DIR at a directory when
+# diskcache is installed.
+DISK_CACHE_DIR = os.getenv("ODDS_DISK_CACHE_DIR", "")
+DISK_CACHE_TTL = float(os.getenv("ODDS_DISK_CACHE_TTL", "180"))
+_DISK_CACHE = None
+if DISK_CACHE_DIR:
+    try:
+        import diskcache
+        _DISK_CACHE = diskcache.Cache(DISK_CACHE_DIR)
+    except ImportError:  # diskcache is optional; only the in-process cache is used
+        pass
+
+
+def _disk_key() -> Tuple[str, str, str]:
+    return ("basketball_nba", REGIONS, MARKETS)
+
+
+def _disk_get() -> Optional[List[Dict[str, Any]]]:
+    if _DISK_CACHE is None:
+        return None
+    try:
+        return _DISK_CACHE.get(_disk_key())
+    except Exception:
+        # A locked or corrupt cache file must not break odds fetching
+        return None
+
+
+def _disk_set(events: List[Dict[str, Any]]) -> None:
+    if _DISK_CACHE is None:
+        return
+    try:
+        _DISK_CACHE.set(_disk_key(), events, expire=DISK_CACHE_TTL)
+    except Exception:
+        pass
 
 
 def current_odds() -> List[Dict[str, Any]]:
-    c = get_client()
-    params = {
+    """Return league-wide current odds, served from cache within CACHE_TTL.
+
+    Concurrent callers on a cache miss wait for a single upstream fetch. With
+    the disk cache enabled, a fetch made by another process within
+    DISK_CACHE_TTL is reused before calling the API.
+    """
+    key = (REGIONS, MARKETS)
+    events = _ODDS_CACHE.get(key)
+    if events is not None:
+        return events
+    with _ODDS_LOCK:
+        events = _ODDS_CACHE.get(key)
+        if events is None:
+            events = _disk_get()
+            if events is None:
+                events = _fetch_current_odds()
+                _disk_set(events)
+            _ODDS_CACHE.set(key, events)
+    return events
+
+
+async def current_odds_async(c: httpx.AsyncClient) -> List[Dict[str, Any]]:
+    """Async current_odds(); a fresh cache entry is returned without a request."""
+    key = (REGIONS, MARKETS)
+    events = _ODDS_CACHE.get(key)
+    if events is None:
+        events = _disk_get()
+        if events is None:
+            events = _as_events(await afetch(c, BASE, params=_odds_params()))
+            _disk_set(events)
+        _ODDS_CACHE.set(key, events)
+    return events
+
+
+def _odds_params() -> Dict[str, str]:
+    return {
         "apiKey": KEY or "",
         "regions": REGIONS,
         "markets": MARKETS,
         "oddsFormat": "decimal",
     }
-    data = fetch(c, BASE, params=params)
+
+
+def _as_events(data: Any) -> List[Dict[str, Any]]:
     if isinstance(data, list):
         return data
     return []
 
 
+def _fetch_current_odds() -> List[Dict[str, Any]]:
+    return _as_events(fetch(get_client(), BASE, params=_odds_params()))
+
+
+def index_events(events: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Pair each event with its lowercased "home\0away" haystack.
+
+    Build this once when matching many teams against the same events.
+    """
+    return [
+        (f"{ev.get('home_team') or ''}\x00{ev.get('away_team') or ''}".lower(), ev)
+        for ev in events
+    ]
+
+
+def find_odds_in_index(index: List[Tuple[str, Dict[str, Any]]], team_names: List[str]) -> List[Dict[str, Any]]:
+    """find_odds_for_matchup() over a prebuilt index_events() list."""
+    tokens = [re.escape(t.lower()) for t in team_names if t]
+    if not tokens:
+        return []
+    # One alternation keeps the scan in the regex engine; the NUL separator
+    # stops a token from matching across the home/away boundary
+    search = re.compile("|".join(tokens)).search
+    return [ev for hay, ev in index if search(hay)]
+
+
 def find_odds_for_matchup(events: List[Dict[str, Any]], team_names: List[str]) -> List[Dict[str, Any]]:
     """Filter odds events that include any of the provided team name tokens.
 
     team_names: list like ["Chicago Bulls", "Bulls", "CHI"]
     """
-    tokens = [t.lower() for t in team_names if t]
-    results: List[Dict[str, Any]] = []
-    for ev in events:
-        home = (ev.get("home_team") or "").lower()
-        away = (ev.get("away_team") or "").lower()
-        if any(tok in home or tok in away for tok in tokens):
-            results.append(ev)
-    return results
+    return find_odds_in_index(index_events(events), team_names)
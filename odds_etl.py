@@ -12,19 +12,33 @@ Usage:
 """
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+import numpy as np
 from dotenv import load_dotenv
 from bdl import team_lookup as bdl_team_lookup, games_by_team as bdl_games_by_team
 from odds_api import current_odds as odds_current_odds
 from supabase_client import get_supabase_client
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy kernel below is used instead
+    njit = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:  # ciso8601 is optional; datetime.fromisoformat is the slower fallback
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_NBA_SEASON = int(os.getenv("DEFAULT_NBA_SEASON", "2025"))
+
 
 def parse_spread(outcomes: List[Dict[str, Any]], team_name: str) -> Optional[float]:
     """Extract spread line for a given team from outcomes list."""
@@ -42,6 +56,13 @@ def parse_total(outcomes: List[Dict[str, Any]]) -> Optional[float]:
     return None
 
 
+def parse_game_date(value: str) -> datetime:
+    """Parse a BDL game date ("2025-01-15" or full ISO 8601) as aware UTC."""
+    dt = _parse_iso(value)
+    # Date-only values carry no offset; BDL dates are UTC
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
 def compute_ats(team_score: int, opp_score: int, spread: float, is_home: bool) -> str:
     """Compute ATS result: W/L/P.
     
@@ -63,8 +84,122 @@ def compute_ou(team_score: int, opp_score: int, total: float) -> str:
     return 'O' if diff > 0 else 'U'
 
 
-def ingest_odds_for_team(team_abbr: str, days: int = 30) -> None:
-    """Fetch recent games, match with odds, store in Supabase."""
+# Outcome codes shared by both kernels: 0 = not played, 1 = L/U, 2 = push,
+# 3 = W/O. Decoded to labels once per batch.
+_ATS_LABELS = np.array([None, 'L', 'P', 'W'], dtype=object)
+_OU_LABELS = np.array([None, 'U', 'P', 'O'], dtype=object)
+
+
+def _outcome_codes_np(team: np.ndarray, opp: np.ndarray, k: float, c: float) -> np.ndarray:
+    """Codes for team + k*opp + c (ATS: k=-1, c=spread; O/U: k=1, c=-total)."""
+    v = team + k * opp + c
+    codes = np.where(np.abs(v) < 0.01, 2, np.where(v > 0, 3, 1)).astype(np.int8)
+    codes[(team == 0) | (opp == 0)] = 0
+    return codes
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _outcome_codes(team, opp, k, c):
+        # Same result as _outcome_codes_np in one fused native loop
+        n = team.shape[0]
+        codes = np.empty(n, np.int8)
+        for i in range(n):
+            if team[i] == 0 or opp[i] == 0:
+                codes[i] = 0
+                continue
+            v = team[i] + k * opp[i] + c
+            if abs(v) < 0.01:
+                codes[i] = 2
+            elif v > 0:
+                codes[i] = 3
+            else:
+                codes[i] = 1
+        return codes
+else:
+    _outcome_codes = _outcome_codes_np
+
+
+def compute_ats_ou_batch(
+    team_scores: List[int],
+    opp_scores: List[int],
+    spread: Optional[float],
+    total: Optional[float],
+) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """Vectorized compute_ats/compute_ou over many games with the same lines.
+
+    A game gets None when a line is missing or either score is 0 (not played).
+    Runs as a numba kernel when numba is installed, numpy otherwise.
+    """
+    n = len(team_scores)
+    if n == 0:
+        return [], []
+    team = np.asarray(team_scores, dtype=np.float64)
+    opp = np.asarray(opp_scores, dtype=np.float64)
+    ats: List[Optional[str]] = [None] * n
+    ou: List[Optional[str]] = [None] * n
+    if spread is not None:
+        ats = _ATS_LABELS[_outcome_codes(team, opp, -1.0, float(spread))].tolist()
+    if total is not None:
+        ou = _OU_LABELS[_outcome_codes(team, opp, 1.0, -float(total))].tolist()
+    return ats, ou
+
+
+# (spread_line, total_line, h2h_team, h2h_opp), each None when unavailable
+Lines = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+def _event_lines(ev: Dict[str, Any], team_name: str) -> Lines:
+    """Read lines from the event's first bookmaker, from team_name's side."""
+    spread_line = None
+    total_line = None
+    h2h_team = None
+    h2h_opp = None
+    bookmakers = ev.get('bookmakers', [])
+    if bookmakers:
+        team_low = team_name.lower()
+        for mkt in bookmakers[0].get('markets', []):
+            if mkt.get('key') == 'spreads':
+                spread_line = parse_spread(mkt.get('outcomes', []), team_name)
+            elif mkt.get('key') == 'totals':
+                total_line = parse_total(mkt.get('outcomes', []))
+            elif mkt.get('key') == 'h2h':
+                for out in mkt.get('outcomes', []):
+                    if team_low in out.get('name', '').lower():
+                        h2h_team = float(out.get('price', 0))
+                    else:
+                        h2h_opp = float(out.get('price', 0))
+    return spread_line, total_line, h2h_team, h2h_opp
+
+
+def build_odds_index(odds_events: List[Dict[str, Any]]) -> Dict[str, Lines]:
+    """Map lowercased team name -> lines from the first event listing it.
+
+    One pass over the events replaces a scan of every event for every game.
+    """
+    index: Dict[str, Lines] = {}
+    for ev in odds_events:
+        for name in (ev.get('home_team') or '', ev.get('away_team') or ''):
+            key = name.lower()
+            if key and key not in index:
+                try:
+                    index[key] = _event_lines(ev, name)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Unparseable odds for {name}: {e}")
+                    index[key] = (None, None, None, None)
+    return index
+
+
+def ingest_odds_for_team(
+    team_abbr: str,
+    days: int = 30,
+    odds_events: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Fetch recent games, match with odds, store in Supabase.
+
+    odds_events: league-wide events from current_odds(); pass them in when
+    ingesting several teams so the odds are fetched only once.
+    """
     sb = get_supabase_client()
     if not sb:
         logger.error("Supabase client not available")
@@ -77,7 +212,7 @@ def ingest_odds_for_team(team_abbr: str, days: int = 30) -> None:
         return
     team_id = team['id']
     team_full_name = team.get('full_name') or team.get('name')
-    season = int(os.getenv("DEFAULT_NBA_SEASON", "2025"))
+    season = DEFAULT_NBA_SEASON
 
     # 2) Fetch recent games from BDL
     logger.info(f"Fetching games for {team_abbr} (season {season})")
@@ -86,19 +221,25 @@ def ingest_odds_for_team(team_abbr: str, days: int = 30) -> None:
     logger.info(f"Found {len(games)} games for {team_abbr}")
 
     # 3) Fetch current odds from The Odds API (for upcoming or recent)
-    logger.info("Fetching odds from The Odds API")
-    odds_events = odds_current_odds() or []
+    if odds_events is None:
+        logger.info("Fetching odds from The Odds API")
+        odds_events = odds_current_odds() or []
     logger.info(f"Found {len(odds_events)} odds events")
 
-    # 4) Match and upsert
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    rows = []
+    # 4) Match and upsert. Current odds are matched by team name only, so
+    # every game of this team reads the same lines.
+    no_lines: Lines = (None, None, None, None)
+    team_lines = build_odds_index(odds_events).get((team_full_name or '').lower(), no_lines)
+    spread_line, total_line, h2h_team, h2h_opp = team_lines
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    # Parse games first, then compute all ATS/O-U outcomes in one batch
+    parsed = []
     for g in games:
         try:
             game_date_str = g.get('date') or ''
             if not game_date_str:
                 continue
-            game_date = datetime.fromisoformat(game_date_str.replace('Z', '+00:00'))
+            game_date = parse_game_date(game_date_str)
             if game_date < cutoff:
                 continue
             
@@ -109,61 +250,32 @@ def ingest_odds_for_team(team_abbr: str, days: int = 30) -> None:
             
             team_score = int(g.get('home_team_score') or 0) if is_home else int(g.get('visitor_team_score') or 0)
             opp_score = int(g.get('visitor_team_score') or 0) if is_home else int(g.get('home_team_score') or 0)
-            
-            # Try to find matching odds event
-            spread_line = None
-            total_line = None
-            h2h_team = None
-            h2h_opp = None
-            
-            for ev in odds_events:
-                ev_home = ev.get('home_team', '')
-                ev_away = ev.get('away_team', '')
-                # Simple name match (could be improved with fuzzy)
-                if team_full_name.lower() in ev_home.lower() or team_full_name.lower() in ev_away.lower():
-                    bookmakers = ev.get('bookmakers', [])
-                    if bookmakers:
-                        bm = bookmakers[0]
-                        markets = bm.get('markets', [])
-                        for mkt in markets:
-                            if mkt.get('key') == 'spreads':
-                                spread_line = parse_spread(mkt.get('outcomes', []), team_full_name)
-                            elif mkt.get('key') == 'totals':
-                                total_line = parse_total(mkt.get('outcomes', []))
-                            elif mkt.get('key') == 'h2h':
-                                for out in mkt.get('outcomes', []):
-                                    if team_full_name.lower() in out.get('name', '').lower():
-                                        h2h_team = float(out.get('price', 0))
-                                    else:
-                                        h2h_opp = float(out.get('price', 0))
-                    break
-            
-            # Compute ATS/O-U if we have lines and results
-            ats_result = None
-            ou_result = None
-            if spread_line is not None and team_score and opp_score:
-                ats_result = compute_ats(team_score, opp_score, spread_line, is_home)
-            if total_line is not None and team_score and opp_score:
-                ou_result = compute_ou(team_score, opp_score, total_line)
-            
-            row = {
-                'team_abbr': team_abbr,
-                'opponent_abbr': opponent_abbr,
-                'game_date': game_date.date().isoformat(),
-                'is_home': is_home,
-                'spread_line': spread_line,
-                'total_line': total_line,
-                'h2h_team_odds': h2h_team,
-                'h2h_opp_odds': h2h_opp,
-                'team_score': team_score if team_score else None,
-                'opp_score': opp_score if opp_score else None,
-                'ats_result': ats_result,
-                'ou_result': ou_result,
-            }
-            rows.append(row)
+            parsed.append((game_date, is_home, opponent_abbr, team_score, opp_score))
         except Exception as e:
             logger.warning(f"Error processing game: {e}")
             continue
+
+    ats_results, ou_results = compute_ats_ou_batch(
+        [p[3] for p in parsed], [p[4] for p in parsed], spread_line, total_line
+    )
+    rows = [
+        {
+            'team_abbr': team_abbr,
+            'opponent_abbr': opponent_abbr,
+            'game_date': game_date.date().isoformat(),
+            'is_home': is_home,
+            'spread_line': spread_line,
+            'total_line': total_line,
+            'h2h_team_odds': h2h_team,
+            'h2h_opp_odds': h2h_opp,
+            'team_score': team_score if team_score else None,
+            'opp_score': opp_score if opp_score else None,
+            'ats_result': ats_result,
+            'ou_result': ou_result,
+        }
+        for (game_date, is_home, opponent_abbr, team_score, opp_score), ats_result, ou_result
+        in zip(parsed, ats_results, ou_results)
+    ]
     
     if not rows:
         logger.info("No rows to insert")
@@ -1,93 +1,161 @@
 """
 Scheduler script for refreshing team reports.
 
-This script can be run manually or via cron to refresh and store reports for
-multiple teams at regular intervals. It relies on the same scraping and
-Supabase functions used by the application. To schedule regular updates,
-configure your system's cron scheduler to call this script (e.g., every
-morning).
+This script can be run manually or via cron to refresh and store team data
+(teams, games, injuries and odds) for every supported team at regular
+intervals. It loads the same tables as etl_bdl.py, but fans the teams out
+concurrently over one async HTTP client instead of walking them one by one.
+To schedule regular updates, configure your system's cron scheduler to call
+this script (e.g., every morning).
 
 Usage:
     python3 scheduler.py
 """
+import asyncio
 import os
 import logging
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from fetch_data import assemble_team_report
-from app import save_report, SUPABASE_URL, SUPABASE_SERVICE_KEY, DEFAULT_NBA_SEASON
+import httpx
+from app import DEFAULT_NBA_SEASON
+from bdl import team_lookup_async, games_by_team_async, injuries_by_team_async
+from clients import make_async_client
+from etl_bdl import TeamRows, build_team_rows, merge_team_rows, team_odds_names
+from odds_api import current_odds_async, find_odds_in_index, index_events
+from supabase_client import SUPABASE_URL, SUPABASE_SERVICE_KEY, rest_post_async
 
 # Load environment variables
 load_dotenv()
 
+# Upper bound on teams refreshed at once; keeps BDL under its rate limit
+MAX_CONCURRENCY = int(os.getenv("SCHEDULER_CONCURRENCY", "8"))
+
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=getattr(logging, LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
 
-SUPPORTED_TEAMS = {
+# Teams refreshed by the scheduler as parallel tuples: SLUGS[i] is the
+# frontend slug for the Basketball-Reference abbreviation ABBRS[i]
+SLUGS = (
     # Atlantic Division
-    'celtics': 'BOS',
-    'nets': 'BRK', 
-    'knicks': 'NYK',
-    '76ers': 'PHI',
-    'raptors': 'TOR',
-    
+    'celtics', 'nets', 'knicks', '76ers', 'raptors',
+
     # Central Division
-    'bulls': 'CHI',
-    'cavaliers': 'CLE',
-    'pistons': 'DET',
-    'pacers': 'IND',
-    'bucks': 'MIL',
-    
+    'bulls', 'cavaliers', 'pistons', 'pacers', 'bucks',
+
     # Southeast Division
-    'hawks': 'ATL',
-    'hornets': 'CHA',
-    'heat': 'MIA',
-    'magic': 'ORL',
-    'wizards': 'WAS',
-    
+    'hawks', 'hornets', 'heat', 'magic', 'wizards',
+
     # Northwest Division
-    'nuggets': 'DEN',
-    'timberwolves': 'MIN',
-    'thunder': 'OKC',
-    'trail-blazers': 'POR',
-    'jazz': 'UTA',
-    
+    'nuggets', 'timberwolves', 'thunder', 'trail-blazers', 'jazz',
+
     # Pacific Division
-    'warriors': 'GSW',
-    'clippers': 'LAC',
-    'lakers': 'LAL',
-    'suns': 'PHX',
-    'kings': 'SAC',
-    
+    'warriors', 'clippers', 'lakers', 'suns', 'kings',
+
     # Southwest Division
-    'mavericks': 'DAL',
-    'rockets': 'HOU',
-    'grizzlies': 'MEM',
-    'pelicans': 'NOP',
-    'spurs': 'SAS'
-}
+    'mavericks', 'rockets', 'grizzlies', 'pelicans', 'spurs',
+)
 
+ABBRS = (
+    # Atlantic Division
+    'BOS', 'BRK', 'NYK', 'PHI', 'TOR',
 
-def refresh_all_teams():
-    if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
-        logger.warning("Supabase not configured; skipping refresh.")
-        return
-        
-    logger.info(f"Starting refresh for {len(SUPPORTED_TEAMS)} teams")
-    
-    for slug, br_abbr in SUPPORTED_TEAMS.items():
+    # Central Division
+    'CHI', 'CLE', 'DET', 'IND', 'MIL',
+
+    # Southeast Division
+    'ATL', 'CHA', 'MIA', 'ORL', 'WAS',
+
+    # Northwest Division
+    'DEN', 'MIN', 'OKC', 'POR', 'UTA',
+
+    # Pacific Division
+    'GSW', 'LAC', 'LAL', 'PHX', 'SAC',
+
+    # Southwest Division
+    'DAL', 'HOU', 'MEM', 'NOP', 'SAS',
+)
+
+assert len(SLUGS) == len(ABBRS), "SLUGS and ABBRS must stay aligned"
+SUPPORTED_TEAMS = dict(zip(SLUGS, ABBRS))
+
+
+async def refresh_one(
+    slug: str,
+    br_abbr: str,
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    odds_index: List[Tuple[str, Dict[str, Any]]],
+) -> Optional[TeamRows]:
+    async with sem:
         try:
             logger.info(f"Refreshing data for {slug} ({br_abbr})")
-            report = assemble_team_report(br_abbr, season=DEFAULT_NBA_SEASON)
-            save_report(slug, report, bearer_token=None)
-            logger.info(f"Successfully refreshed {slug}")
+            # BR and BDL abbreviations differ for a few teams (BRK vs BKN),
+            # so fall back to the nickname
+            team = await team_lookup_async(client, br_abbr)
+            if not team:
+                team = await team_lookup_async(client, slug.replace("-", " "))
+            if not team:
+                logger.error(f"Failed to refresh {slug}: team not found")
+                return None
+            team_id = team.get("id")
+            games, injuries = await asyncio.gather(
+                games_by_team_async(client, team_id, season=DEFAULT_NBA_SEASON),
+                injuries_by_team_async(client, team_id),
+            )
+            selected = find_odds_in_index(odds_index, team_odds_names(team))
+            logger.info(f"Fetched data for {slug}")
+            return build_team_rows(
+                team,
+                (games or {}).get("data", []),
+                (injuries or {}).get("data", []),
+                selected,
+            )
         except Exception as e:
             logger.error(f"Failed to refresh {slug}: {e}")
-    
+            return None
+
+
+async def refresh_all_teams_async() -> None:
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with make_async_client() as client:
+        # League-wide odds are the same for every team; fetch them once
+        try:
+            events = await current_odds_async(client)
+        except Exception as e:
+            logger.warning(f"Odds unavailable, continuing without: {e}")
+            events = []
+        odds_index = index_events(events)
+        batches = await asyncio.gather(*[
+            refresh_one(slug, br_abbr, client, sem, odds_index)
+            for slug, br_abbr in zip(SLUGS, ABBRS)
+        ])
+        # One upsert per table for the whole run instead of one per team
+        teams, games, injuries, odds = merge_team_rows(batches)
+        writes = [
+            rest_post_async(client, "teams", teams, on_conflict="id"),
+            rest_post_async(client, "games", games, on_conflict="id"),
+        ]
+        if injuries:
+            writes.append(rest_post_async(client, "injuries", injuries))
+        if odds:
+            writes.append(rest_post_async(client, "odds", odds))
+        await asyncio.gather(*writes)
+        refreshed = sum(1 for b in batches if b)
+        logger.info(f"Stored {len(teams)} teams, {len(games)} games, {len(injuries)} injuries, {len(odds)} odds for {refreshed} teams")
+
+
+def refresh_all_teams():
+    if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
+        logger.warning("Supabase not configured; skipping refresh.")
+        return
+
+    logger.info(f"Starting refresh for {len(SLUGS)} teams")
+    asyncio.run(refresh_all_teams_async())
     logger.info("Team refresh process completed")
 
 
 if __name__ == '__main__':
-    refresh_all_teams()
\ No newline at end of file
+    refresh_all_teams()
@@ -1,34 +1,122 @@
+import functools
+import gzip
 import os
 import json
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    def _json_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is the slower fallback
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "").rstrip("/")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
 
-
-def _headers() -> Dict[str, str]:
+# Gzip insert bodies above GZIP_MIN_BYTES. Off by default: only enable when
+# the gateway in front of PostgREST decodes `Content-Encoding: gzip` requests.
+SUPABASE_GZIP = os.getenv("SUPABASE_GZIP", "0").strip().lower() in {"1", "true", "yes", "on"}
+GZIP_MIN_BYTES = 1024
+
+# PostgREST handles large bodies poorly; split bigger inserts into chunks
+POST_BATCH_SIZE = 1000
+
+# One pooled keep-alive session for every Supabase call (rest_post and the
+# query client), so repeated requests reuse the TLS connection. urllib3
+# retries only failures where the row cannot have been written (connection refused, 429/503), so plain inserts are never doubled.
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=3,
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset({"GET", "POST"}),
+    backoff_factor=0.3,
+    respect_retry_after_header=True,
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_RETRY))
+
+
+@functools.lru_cache(maxsize=1)
+def _headers_for(key: str) -> Dict[str, str]:
     return {
         "Content-Type": "application/json",
-        "apikey": SUPABASE_SERVICE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
         "Prefer": "return=minimal",
     }
 
 
+def _headers() -> Dict[str, str]:
+    """Return the shared request headers; callers must copy before changing them.
+
+    Built once per service key rather than on every request.
+    """
+    return _headers_for(SUPABASE_SERVICE_KEY)
+
+
+def _post_body(rows: List[Dict[str, Any]], headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize rows, gzipping large bodies when SUPABASE_GZIP is on."""
+    body = _json_bytes(rows)
+    if SUPABASE_GZIP and len(body) >= GZIP_MIN_BYTES:
+        # Level 1: odds rows carry the raw event JSON and shrink ~5-10x even
+        # at the fastest setting
+        return gzip.compress(body, compresslevel=1), {**headers, "Content-Encoding": "gzip"}
+    return body, headers
+
+
 def rest_post(table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str] = None) -> None:
     if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
         return
     url = f"{SUPABASE_URL}/rest/v1/{table}"
     if on_conflict:
         url = f"{url}?on_conflict={on_conflict}"
-    try:
-        requests.post(url, headers=_headers(), data=json.dumps(rows), timeout=10)
-    except requests.exceptions.RequestException:
-        pass
+    headers = _headers()
+    for i in range(0, len(rows), POST_BATCH_SIZE):
+        try:
+            # return=minimal: the body is empty, so only the status is checked
+            body, body_headers = _post_body(rows[i:i + POST_BATCH_SIZE], headers)
+            resp = _SESSION.post(url, headers=body_headers, data=body, timeout=10)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Supabase insert into {table} failed: {e}")
+            continue
+        if not resp.ok:
+            logger.warning(f"Supabase insert into {table} returned {resp.status_code}: {resp.text[:200]}")
+
+
+async def rest_post_async(
+    c: httpx.AsyncClient, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str] = None
+) -> None:
+    """Async rest_post() over a caller-owned httpx.AsyncClient."""
+    if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
+        return
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    if on_conflict:
+        url = f"{url}?on_conflict={on_conflict}"
+    headers = _headers()
+    for i in range(0, len(rows), POST_BATCH_SIZE):
+        try:
+            body, body_headers = _post_body(rows[i:i + POST_BATCH_SIZE], headers)
+            await c.post(url, headers=body_headers, content=body, timeout=10)
+        except httpx.HTTPError:
+            pass
 
 
 def insert_teams(teams: List[Dict[str, Any]]) -> None:
@@ -49,64 +137,77 @@ def insert_odds(odds_rows: List[Dict[str, Any]]) -> None:
     rest_post("odds", odds_rows)
 
 
-def get_supabase_client():
-    """Return a minimal Supabase-like client for queries (used by odds_etl)."""
-    if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
+class InsertResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def execute(self):
+        return self
+
+
+class SupabaseQuery:
+    def __init__(self, url: str, cols: str):
+        self.url = url
+        self.params = {"select": cols}
+
+    def eq(self, col: str, val: Any):
+        self.params[col] = f"eq.{val}"
+        return self
+
+    def order(self, col: str, desc: bool = False):
+        self.params["order"] = f"{col}.{'desc' if desc else 'asc'}"
+        return self
+
+    def limit(self, n: int):
+        self.params["limit"] = n
+        return self
+
+    def execute(self):
+        resp = _SESSION.get(self.url, headers=_headers(), params=self.params, timeout=10)
+        resp.raise_for_status()
+        return type('Resp', (), {'data': _loads(resp.content)})()
+
+
+class SupabaseTable:
+    def __init__(self, base_url: str, table_name: str):
+        self.table_name = table_name
+        self.url = f"{base_url}/rest/v1/{table_name}"
+
+    def insert(self, rows: List[Dict[str, Any]], upsert: bool = False):
+        headers = {**_headers(), "Prefer": "return=representation"}
+        # For upsert, we need to use on_conflict parameter
+        url = self.url
+        if upsert:
+            # Assuming conflict on (team_abbr, game_date)
+            url = f"{url}?on_conflict=team_abbr,game_date"
+        resp = _SESSION.post(url, headers=headers, data=_json_bytes(rows), timeout=10)
+        resp.raise_for_status()
+        # Return an object that has an execute() method
+        return InsertResponse(_loads(resp.content))
+
+    def select(self, cols: str = "*"):
+        return SupabaseQuery(self.url, cols)
+
+
+class SupabaseClient:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def table(self, name: str):
+        return SupabaseTable(self.base_url, name)
+
+
+@functools.lru_cache(maxsize=1)
+def _client_for(url: str, key: str) -> Optional[SupabaseClient]:
+    if not (url and key):
         return None
-    
-    class SupabaseTable:
-        def __init__(self, table_name: str):
-            self.table_name = table_name
-            self.url = f"{SUPABASE_URL}/rest/v1/{table_name}"
-        
-        def insert(self, rows: List[Dict[str, Any]], upsert: bool = False):
-            headers = _headers()
-            headers.pop("Prefer", None)
-            headers["Prefer"] = "return=representation"
-            # For upsert, we need to use on_conflict parameter
-            url = self.url
-            if upsert:
-                # Assuming conflict on (team_abbr, game_date)
-                url = f"{url}?on_conflict=team_abbr,game_date"
-            resp = requests.post(url, headers=headers, json=rows, timeout=10)
-            resp.raise_for_status()
-            
-            # Return an object that has an execute() method
-            class InsertResponse:
-                def __init__(self, data):
-                    self.data = data
-                def execute(self):
-                    return self
-            
-            return InsertResponse(resp.json())
-        
-        def select(self, cols: str = "*"):
-            return SupabaseQuery(self.url, cols)
-    
-    class SupabaseQuery:
-        def __init__(self, url: str, cols: str):
-            self.url = url
-            self.params = {"select": cols}
-        
-        def eq(self, col: str, val: Any):
-            self.params[col] = f"eq.{val}"
-            return self
-        
-        def order(self, col: str, desc: bool = False):
-            self.params["order"] = f"{col}.{'desc' if desc else 'asc'}"
-            return self
-        
-        def limit(self, n: int):
-            self.params["limit"] = n
-            return self
-        
-        def execute(self):
-            resp = requests.get(self.url, headers=_headers(), params=self.params, timeout=10)
-            resp.raise_for_status()
-            return type('Resp', (), {'data': resp.json()})()
-    
-    class SupabaseClient:
-        def table(self, name: str):
-            return SupabaseTable(name)
-    
-    return SupabaseClient()
+    return SupabaseClient(url)
+
+
+def get_supabase_client() -> Optional[SupabaseClient]:
+    """Return a minimal Supabase-like client for queries (used by odds_etl).
+
+    The client is created once and reused; it is keyed on the configured URL
+    and key so a missing configuration is not cached for good.
+    """
+    return _client_for(SUPABASE_URL, SUPABASE_SERVICE_KEY)
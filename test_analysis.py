@@ -5,7 +5,8 @@ import pytest
 from analysis import (
     calculate_basic_metrics,
     calculate_ats_ou_rates,
-    generate_parlay_suggestions
+    generate_parlay_suggestions,
+    summarize
 )
 
 
@@ -182,5 +183,37 @@ class TestGenerateParlaysuggestions:
         assert "Anthony Davis" in player_prop["note"]
 
 
+
+class TestSummarize:
+    """Test the fused rates + suggestions pass."""
+    
+    def test_matches_separate_functions(self):
+        """Test that summarize agrees with the individual functions."""
+        report = {
+            "lines": [
+                {"ats": "W", "ou": "O"},
+                {"ats": "L", "ou": "O"},
+                {"ats": "W", "ou": "U"},
+                {"ats": "W", "ou": "O"},
+                {"ats": "L", "ou": "U"},
+                {"ats": "L", "ou": "U"},
+                {"ats": "L", "ou": "U"}
+            ],
+            "injuries": [{"player": "LeBron James"}]
+        }
+        
+        rates, legs = summarize(report)
+        
+        assert rates == calculate_ats_ou_rates(report)
+        assert legs == generate_parlay_suggestions(report)
+    
+    def test_empty_report(self):
+        """Test behavior with no lines or injuries."""
+        rates, legs = summarize({})
+        
+        assert rates == {"ats_rate": None, "ou_rate": None}
+        assert legs == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
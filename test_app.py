@@ -1,6 +1,7 @@
 """
 Tests for app.py module.
 """
+import gzip
 import json
 import pytest
 from unittest.mock import patch, Mock, MagicMock
@@ -8,7 +9,7 @@ from http.server import HTTPServer
 import threading
 import time
 import requests
-from app import FullHandler, save_report, fetch_reports
+from app import FullHandler, save_report, fetch_reports, _resolve_br_abbr
 
 
 class TestFullHandler:
@@ -54,28 +55,132 @@ class TestFullHandler:
         mock_rates.assert_called_once()
         mock_suggestions.assert_called_once()
     
-    @patch('builtins.open')
-    def test_serve_full_page_success(self, mock_open):
+    @patch('app._FULL_HTML_ETAG', '"abc"')
+    @patch('app._FULL_HTML_BYTES', b"<html>Test</html>")
+    def test_serve_full_page_success(self):
         """Test serving the full HTML page successfully."""
-        mock_file = Mock()
-        mock_file.read.return_value = b"<html>Test</html>"
-        mock_open.return_value.__enter__.return_value = mock_file
-        
         self.handler.serve_full_page()
         
         self.handler.send_response.assert_called_with(200)
-        self.handler.send_header.assert_called_with('Content-Type', 'text/html; charset=utf-8')
+        self.handler.send_header.assert_any_call('Content-Type', 'text/html; charset=utf-8')
+        self.handler.send_header.assert_any_call('ETag', '"abc"')
+        self.handler.wfile.write.assert_called_once_with(b"<html>Test</html>")
     
-    @patch('builtins.open')
-    def test_serve_full_page_not_found(self, mock_open):
-        """Test serving page when file not found."""
-        mock_open.side_effect = FileNotFoundError()
+    @patch('app._FULL_HTML_ETAG', '"abc"')
+    @patch('app._FULL_HTML_BYTES', b"<html>Test</html>")
+    def test_serve_full_page_not_modified(self):
+        """Test that a matching If-None-Match yields 304 without a body."""
+        self.handler.headers = {'If-None-Match': '"abc"'}
+        
+        self.handler.serve_full_page()
         
+        self.handler.send_response.assert_called_with(304)
+        self.handler.wfile.write.assert_not_called()
+    
+    @patch('app._FULL_HTML_BYTES', None)
+    def test_serve_full_page_not_found(self):
+        """Test serving page when file not found."""
         self.handler.serve_full_page()
         
         self.handler.send_response.assert_called_with(500)
 
 
+class TestWriteJson:
+    """Test JSON response encoding."""
+    
+    def setup_method(self):
+        self.handler = FullHandler()
+        self.handler.send_response = Mock()
+        self.handler.send_header = Mock()
+        self.handler.end_headers = Mock()
+        self.handler.wfile = Mock()
+    
+    def test_small_body_uncompressed(self):
+        self.handler.headers = {"Accept-Encoding": "gzip"}
+        
+        self.handler._write_json({"ok": True})
+        
+        body = self.handler.wfile.write.call_args[0][0]
+        assert json.loads(body) == {"ok": True}
+        self.handler.send_header.assert_any_call('Content-Length', str(len(body)))
+    
+    def test_large_body_gzipped_when_accepted(self):
+        payload = {"games": [{"id": i, "status": "Final"} for i in range(200)]}
+        self.handler.headers = {"Accept-Encoding": "gzip, deflate"}
+        
+        self.handler._write_json(payload)
+        
+        body = self.handler.wfile.write.call_args[0][0]
+        assert json.loads(gzip.decompress(body)) == payload
+        self.handler.send_header.assert_any_call('Content-Encoding', 'gzip')
+        self.handler.send_header.assert_any_call('Content-Length', str(len(body)))
+    
+    def test_large_body_plain_without_accept_encoding(self):
+        payload = {"games": [{"id": i, "status": "Final"} for i in range(200)]}
+        self.handler.headers = {}
+        
+        self.handler._write_json(payload)
+        
+        body = self.handler.wfile.write.call_args[0][0]
+        assert json.loads(body) == payload
+
+
+class TestReportBdlEndpoint:
+    """Tests for the /api/report_bdl endpoint."""
+    
+    def setup_method(self):
+        from app import _REPORT_CACHE
+        _REPORT_CACHE.clear()
+        self.handler = FullHandler()
+        self.handler.send_response = Mock()
+        self.handler.send_header = Mock()
+        self.handler.end_headers = Mock()
+        self.handler.wfile = Mock()
+    
+    @patch('app.odds_current_odds')
+    @patch('app.bdl_injuries_by_team')
+    @patch('app.bdl_games_by_team')
+    @patch('app.bdl_team_lookup')
+    def test_payload_cached_per_team(self, mock_lookup, mock_games, mock_injuries, mock_odds):
+        mock_lookup.return_value = {"id": 5, "full_name": "Chicago Bulls", "abbreviation": "CHI"}
+        mock_games.return_value = {"data": [{"id": 1}]}
+        mock_injuries.return_value = {"data": []}
+        mock_odds.return_value = [{"home_team": "Chicago Bulls", "away_team": "Boston Celtics"}]
+        
+        self.handler.handle_report_bdl("CHI")
+        self.handler.handle_report_bdl("chi ")
+        
+        mock_lookup.assert_called_once_with("CHI")
+        mock_games.assert_called_once()
+        body = json.loads(self.handler.wfile.write.call_args[0][0])
+        assert body["team"]["abbreviation"] == "CHI"
+        assert len(body["odds"]) == 1
+        self.handler.send_header.assert_any_call('Cache-Control', 'public, max-age=30')
+    
+    @patch('app.bdl_team_lookup')
+    def test_unknown_team_not_cached(self, mock_lookup):
+        mock_lookup.return_value = None
+        
+        self.handler.handle_report_bdl("XYZ")
+        self.handler.handle_report_bdl("XYZ")
+        
+        self.handler.send_response.assert_called_with(404)
+        assert mock_lookup.call_count == 2
+
+
+class TestResolveBrAbbr:
+    """Test team input normalization."""
+    
+    def test_known_slug(self):
+        assert _resolve_br_abbr("Bulls ") == ("bulls", "CHI")
+    
+    def test_known_abbr_maps_back_to_slug(self):
+        assert _resolve_br_abbr("chi") == ("bulls", "CHI")
+    
+    def test_unknown_input_fallback(self):
+        assert _resolve_br_abbr("xyz") == ("xyz", "XYZ")
+
+
 class TestSupabaseFunctions:
     """Test Supabase integration functions."""
     
@@ -117,6 +222,37 @@ class TestSupabaseFunctions:
         assert result[0]["team"] == "bos"
         mock_get.assert_called_once()
     
+    @patch('app.requests.get')
+    @patch('app.SUPABASE_URL', 'https://test.supabase.co')
+    @patch('app.SUPABASE_SERVICE_KEY', 'test-key')
+    def test_fetch_reports_pagination(self, mock_get):
+        """Test that ordering and paging are pushed to PostgREST."""
+        mock_get.return_value.json.return_value = []
+        
+        fetch_reports(None, "bos", limit=20, offset=40)
+        
+        url = mock_get.call_args[0][0]
+        assert "team=eq.bos" in url
+        assert url.endswith("order=created_at.desc&limit=20&offset=40")
+    
+    @patch('app.fetch_reports')
+    @patch('app.SUPABASE_URL', 'https://test.supabase.co')
+    @patch('app.SUPABASE_SERVICE_KEY', 'test-key')
+    def test_list_reports_clamps_paging(self, mock_fetch):
+        """Test that invalid or oversized paging params are sanitized."""
+        mock_fetch.return_value = []
+        handler = FullHandler()
+        handler.send_response = Mock()
+        handler.send_header = Mock()
+        handler.end_headers = Mock()
+        handler.wfile = Mock()
+        
+        handler.handle_list_reports({"limit": ["100000"], "offset": ["abc"]})
+        
+        kwargs = mock_fetch.call_args[1]
+        assert kwargs["limit"] == 500
+        assert kwargs["offset"] == 0
+    
     @patch('app.requests.get')
     def test_fetch_reports_no_config(self, mock_get):
         """Test fetch reports when Supabase not configured."""
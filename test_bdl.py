@@ -0,0 +1,121 @@
+"""
+Tests for bdl.py module.
+"""
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch, Mock
+
+import bdl
+
+
+TEAMS = {
+    "data": [
+        {"id": 5, "abbreviation": "CHI", "full_name": "Chicago Bulls", "name": "Bulls"},
+        {"id": 4, "abbreviation": "CHA", "full_name": "Charlotte Hornets", "name": "Hornets"},
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_state(monkeypatch):
+    """Start every test with an empty team cache and injuries enabled."""
+    bdl._TEAM_CACHE.clear()
+    monkeypatch.setattr(bdl, "_INJ_BLOCKED", False)
+    yield
+    bdl._TEAM_CACHE.clear()
+
+
+class TestTeamLookup:
+    """Test team resolution against BDL search results."""
+
+    def test_module_is_canonical(self):
+        """Test that the imported bdl module exposes the robust lookup."""
+        assert bdl.__file__.endswith("bdl.py")
+        assert "prefer exact abbreviation match" in bdl.team_lookup.__doc__
+
+    @patch('bdl.fetch')
+    def test_prefers_exact_abbreviation(self, mock_fetch):
+        """Test that 'CHA' resolves to Charlotte even if Chicago is listed first."""
+        mock_fetch.return_value = TEAMS
+
+        team = bdl.team_lookup("cha")
+
+        assert team["full_name"] == "Charlotte Hornets"
+
+    @patch('bdl.fetch')
+    def test_exact_name_match(self, mock_fetch):
+        """Test case-insensitive full name match."""
+        mock_fetch.return_value = TEAMS
+
+        team = bdl.team_lookup("charlotte hornets")
+
+        assert team["id"] == 4
+
+    @patch('bdl.fetch')
+    def test_no_results(self, mock_fetch):
+        """Test that empty search results yield None."""
+        mock_fetch.return_value = {"data": []}
+
+        assert bdl.team_lookup("XYZ") is None
+
+    def test_blank_query(self):
+        """Test that blank input never hits the network."""
+        with patch('bdl.fetch') as mock_fetch:
+            assert bdl.team_lookup("  ") is None
+        mock_fetch.assert_not_called()
+
+    @patch('bdl.fetch')
+    def test_cached_between_calls(self, mock_fetch):
+        """Test that repeated lookups are served from the in-process cache."""
+        mock_fetch.return_value = TEAMS
+
+        first = bdl.team_lookup("CHI")
+        second = bdl.team_lookup("chi")
+
+        assert first is second
+        mock_fetch.assert_called_once()
+
+    @patch('bdl.afetch')
+    def test_async_lookup_shares_cache(self, mock_afetch):
+        """Test that the async lookup applies the same rules and fills the shared cache."""
+        async def fake_afetch(*args, **kwargs):
+            return TEAMS
+        mock_afetch.side_effect = fake_afetch
+
+        team = asyncio.run(bdl.team_lookup_async(Mock(), "CHA"))
+
+        assert team["id"] == 4
+        with patch('bdl.fetch') as mock_fetch:
+            assert bdl.team_lookup("cha") is team
+        mock_fetch.assert_not_called()
+
+
+class TestInjuriesByTeam:
+    """Test the injuries endpoint fallback."""
+
+    @patch('bdl.fetch')
+    def test_unauthorized_short_circuits(self, mock_fetch):
+        """Test that a 401 disables further injuries requests."""
+        response = Mock(status_code=401)
+        mock_fetch.side_effect = httpx.HTTPStatusError("401", request=Mock(), response=response)
+
+        assert bdl.injuries_by_team(5) == {"data": []}
+        assert bdl.injuries_by_team(5) == {"data": []}
+
+        mock_fetch.assert_called_once()
+
+    @patch('bdl.fetch')
+    def test_transient_error_not_cached(self, mock_fetch):
+        """Test that other errors fall back without disabling the endpoint."""
+        mock_fetch.side_effect = httpx.ConnectError("boom")
+
+        assert bdl.injuries_by_team(5) == {"data": []}
+        assert bdl.injuries_by_team(5) == {"data": []}
+
+        assert mock_fetch.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
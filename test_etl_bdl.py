@@ -0,0 +1,94 @@
+"""
+Tests for etl_bdl.py module.
+"""
+import pytest
+from unittest.mock import patch
+
+import etl_bdl
+
+
+TEAM = {"id": 5, "abbreviation": "CHI", "full_name": "Chicago Bulls", "name": "Bulls", "city": "Chicago"}
+
+
+class TestMergeTeamRows:
+    """Test combining per-team rows into one batch per table."""
+
+    def test_dedupes_shared_games_and_odds(self):
+        """Test that a game or odds event seen by both teams is stored once."""
+        chi = ([{"id": 5}], [{"id": 100}, {"id": 101}], [{"player_id": 1}], [{"id": "ev1"}])
+        bos = ([{"id": 2}], [{"id": 100}], [{"player_id": 2}], [{"id": "ev1"}])
+
+        teams, games, injuries, odds = etl_bdl.merge_team_rows([chi, None, bos])
+
+        assert [t["id"] for t in teams] == [5, 2]
+        assert [g["id"] for g in games] == [100, 101]
+        assert injuries == [{"player_id": 1}, {"player_id": 2}]
+        assert odds == [{"id": "ev1"}]
+
+
+class TestEventId:
+    """Test odds event identifiers."""
+
+    def test_prefers_api_id(self):
+        """Test that the API id is used when present."""
+        assert etl_bdl._event_id({"id": 42, "home_team": "A"}) == "42"
+
+    def test_derived_id_is_stable(self):
+        """Test that events without id hash only teams and commence time."""
+        ev = {"home_team": "Chicago Bulls", "away_team": "Boston Celtics", "commence_time": "2025-01-01T00:00:00Z"}
+        same = dict(ev, bookmakers=[{"key": "x"}])
+        other = dict(ev, commence_time="2025-01-02T00:00:00Z")
+
+        assert etl_bdl._event_id(ev) == etl_bdl._event_id(same)
+        assert etl_bdl._event_id(ev) != etl_bdl._event_id(other)
+        assert len(etl_bdl._event_id(ev)) == 32
+
+
+class TestRunForTeam:
+    """Test that run_for_team only builds rows."""
+
+    @patch('etl_bdl.current_odds')
+    @patch('etl_bdl.injuries_by_team', return_value={"data": []})
+    @patch('etl_bdl.games_by_team', return_value={"data": [{"id": 100, "home_team": {"id": 5}}]})
+    @patch('etl_bdl.team_lookup', return_value=TEAM)
+    def test_returns_rows_with_given_events(self, mock_lookup, mock_games, mock_inj, mock_odds):
+        """Test that provided events are used and nothing is written."""
+        events = [{"id": "ev1", "home_team": "Chicago Bulls", "away_team": "Miami Heat"}]
+
+        with patch('etl_bdl.insert_teams') as mock_insert:
+            teams, games, injuries, odds = etl_bdl.run_for_team("CHI", 2025, events=events)
+
+        mock_insert.assert_not_called()
+        mock_odds.assert_not_called()
+        assert teams[0]["full_name"] == "Chicago Bulls"
+        assert games[0]["home_team_id"] == 5
+        assert injuries == []
+        assert odds[0]["id"] == "ev1"
+
+    @patch('etl_bdl.team_lookup', return_value=None)
+    def test_unknown_team(self, mock_lookup):
+        """Test that an unknown team yields None."""
+        assert etl_bdl.run_for_team("XYZ", 2025, events=[]) is None
+
+
+class TestFetchTeams:
+    """Test the threaded per-team fan-out."""
+
+    @patch('etl_bdl.run_for_team')
+    def test_keeps_order_and_isolates_failures(self, mock_run):
+        """Test that results follow input order and one failure doesn't stop the rest."""
+        def fake_run(team_query, season, events):
+            if team_query == "BAD":
+                raise RuntimeError("boom")
+            return ([{"id": team_query}], [], [], [])
+        mock_run.side_effect = fake_run
+
+        batches = etl_bdl.fetch_teams(["CHI", "BAD", "BOS"], 2025, events=[])
+
+        assert batches[0][0] == [{"id": "CHI"}]
+        assert batches[1] is None
+        assert batches[2][0] == [{"id": "BOS"}]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
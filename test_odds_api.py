@@ -0,0 +1,94 @@
+"""
+Tests for odds_api.py module.
+"""
+import pytest
+from unittest.mock import patch
+
+import odds_api
+from odds_api import find_odds_for_matchup, find_odds_in_index, index_events
+
+
+EVENTS = [
+    {"id": "a", "home_team": "Chicago Bulls", "away_team": "Boston Celtics"},
+    {"id": "b", "home_team": "Charlotte Hornets", "away_team": "Miami Heat"},
+    {"id": "c", "home_team": None, "away_team": "Los Angeles Lakers"},
+]
+
+
+class TestFindOddsForMatchup:
+    """Test filtering odds events by team name tokens."""
+
+    def test_matches_home_or_away_case_insensitive(self):
+        """Test that tokens match either side regardless of case."""
+        assert [ev["id"] for ev in find_odds_for_matchup(EVENTS, ["bulls"])] == ["a"]
+        assert [ev["id"] for ev in find_odds_for_matchup(EVENTS, ["MIAMI HEAT"])] == ["b"]
+
+    def test_any_token_matches(self):
+        """Test that an event is kept when any token matches."""
+        selected = find_odds_for_matchup(EVENTS, ["Celtics", "Lakers", None, ""])
+        assert [ev["id"] for ev in selected] == ["a", "c"]
+
+    def test_tokens_are_literal(self):
+        """Test that regex metacharacters in names are not interpreted."""
+        assert find_odds_for_matchup(EVENTS, ["."]) == []
+
+    def test_no_cross_boundary_match(self):
+        """Test that a token cannot span the end of home and start of away."""
+        assert find_odds_for_matchup(EVENTS, ["bullsboston"]) == []
+
+    def test_empty_tokens(self):
+        """Test that no usable tokens selects nothing."""
+        assert find_odds_for_matchup(EVENTS, []) == []
+        assert find_odds_for_matchup(EVENTS, ["", None]) == []
+
+    def test_index_reuse(self):
+        """Test that a prebuilt index gives the same results across queries."""
+        index = index_events(EVENTS)
+        assert find_odds_in_index(index, ["Hornets"]) == find_odds_for_matchup(EVENTS, ["Hornets"])
+        assert find_odds_in_index(index, ["Lakers"])[0] is EVENTS[2]
+
+
+class FakeDiskCache:
+    """Minimal stand-in for diskcache.Cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+
+class TestCurrentOddsDiskCache:
+    """Test the optional cross-process odds cache."""
+
+    @pytest.fixture(autouse=True)
+    def disk(self, monkeypatch):
+        odds_api._ODDS_CACHE.clear()
+        disk = FakeDiskCache()
+        monkeypatch.setattr(odds_api, "_DISK_CACHE", disk)
+        yield disk
+        odds_api._ODDS_CACHE.clear()
+
+    @patch('odds_api._fetch_current_odds')
+    def test_disk_hit_skips_fetch(self, mock_fetch, disk):
+        """Test that odds stored by another process are reused."""
+        disk.data[odds_api._disk_key()] = EVENTS
+
+        assert odds_api.current_odds() == EVENTS
+        mock_fetch.assert_not_called()
+
+    @patch('odds_api._fetch_current_odds')
+    def test_fetch_fills_disk(self, mock_fetch, disk):
+        """Test that a fetched result is written for other processes."""
+        mock_fetch.return_value = EVENTS
+
+        odds_api.current_odds()
+
+        assert disk.data[odds_api._disk_key()] == EVENTS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,119 @@
+"""
+Tests for odds_etl.py module.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+import odds_etl
+from odds_etl import build_odds_index, compute_ats, compute_ats_ou_batch, compute_ou, parse_game_date
+
+
+def _event(home, away, spread_home=-4.5, total=221.5, bookmakers=True):
+    markets = [
+        {"key": "h2h", "outcomes": [{"name": home, "price": 1.6}, {"name": away, "price": 2.4}]},
+        {"key": "spreads", "outcomes": [
+            {"name": home, "point": spread_home},
+            {"name": away, "point": -spread_home},
+        ]},
+        {"key": "totals", "outcomes": [{"name": "Over", "point": total}, {"name": "Under", "point": total}]},
+    ]
+    return {
+        "home_team": home,
+        "away_team": away,
+        "bookmakers": [{"markets": markets}] if bookmakers else [],
+    }
+
+
+class TestBuildOddsIndex:
+    """Test the per-team odds index used when matching games."""
+
+    def test_lines_from_each_side(self):
+        """Test that home and away keys read lines from their own perspective."""
+        index = build_odds_index([_event("Chicago Bulls", "Boston Celtics")])
+
+        assert index["chicago bulls"] == (-4.5, 221.5, 1.6, 2.4)
+        assert index["boston celtics"] == (4.5, 221.5, 2.4, 1.6)
+
+    def test_first_event_wins(self):
+        """Test that a team listed twice keeps the lines of its first event."""
+        index = build_odds_index([
+            _event("Chicago Bulls", "Boston Celtics", spread_home=-2.0),
+            _event("Miami Heat", "Chicago Bulls", spread_home=-7.0),
+        ])
+
+        assert index["chicago bulls"][0] == -2.0
+
+    def test_event_without_bookmakers(self):
+        """Test that an event without bookmakers yields empty lines."""
+        index = build_odds_index([_event("Chicago Bulls", "Boston Celtics", bookmakers=False)])
+
+        assert index["chicago bulls"] == (None, None, None, None)
+
+    def test_unparseable_prices(self):
+        """Test that bad numeric values do not abort the index build."""
+        ev = _event("Chicago Bulls", "Boston Celtics")
+        ev["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] = "n/a"
+
+        assert build_odds_index([ev])["chicago bulls"] == (None, None, None, None)
+
+
+class TestResults:
+    """Test ATS and O/U outcome helpers."""
+
+    def test_compute_ats(self):
+        """Test win, loss and push against the spread."""
+        assert compute_ats(110, 100, -4.5, True) == 'W'
+        assert compute_ats(102, 100, -4.5, True) == 'L'
+        assert compute_ats(104, 100, -4.0, True) == 'P'
+
+    def test_compute_ou(self):
+        """Test over, under and push against the total."""
+        assert compute_ou(115, 110, 220.5) == 'O'
+        assert compute_ou(100, 100, 220.5) == 'U'
+        assert compute_ou(110, 110, 220.0) == 'P'
+
+    def test_batch_matches_scalar(self):
+        """Test that the batch helper agrees with compute_ats/compute_ou."""
+        team = [110, 102, 104, 115, 0]
+        opp = [100, 100, 100, 110, 98]
+
+        ats, ou = compute_ats_ou_batch(team, opp, -4.0, 214.0)
+
+        assert ats == [compute_ats(t, o, -4.0, True) for t, o in zip(team[:4], opp[:4])] + [None]
+        assert ou == [compute_ou(t, o, 214.0) for t, o in zip(team[:4], opp[:4])] + [None]
+
+    def test_kernel_matches_numpy_reference(self):
+        """Test that the active kernel (numba or numpy) agrees with the numpy one."""
+        team = np.array([110.0, 102.0, 104.0, 0.0])
+        opp = np.array([100.0, 100.0, 100.0, 98.0])
+
+        expected = odds_etl._outcome_codes_np(team, opp, -1.0, -4.0)
+
+        assert expected.tolist() == [3, 1, 2, 0]
+        assert odds_etl._outcome_codes(team, opp, -1.0, -4.0).tolist() == expected.tolist()
+
+    def test_batch_missing_lines(self):
+        """Test that missing lines leave every outcome empty."""
+        assert compute_ats_ou_batch([110], [100], None, None) == ([None], [None])
+        assert compute_ats_ou_batch([], [], -1.0, 200.0) == ([], [])
+
+
+class TestParseGameDate:
+    """Test BDL date parsing."""
+
+    def test_zulu_timestamp(self):
+        """Test that a trailing Z parses as UTC."""
+        assert parse_game_date("2025-01-15T00:00:00.000Z") == datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+    def test_date_only_is_aware(self):
+        """Test that date-only values become aware so they compare with the cutoff."""
+        dt = parse_game_date("2025-01-15")
+
+        assert dt.tzinfo is not None
+        assert dt < datetime.now(timezone.utc)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,120 @@
+"""
+Tests for supabase_client.py module.
+"""
+import gzip
+import json
+
+import pytest
+from unittest.mock import patch
+
+import supabase_client
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    """Pretend Supabase credentials are set."""
+    monkeypatch.setattr(supabase_client, "SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setattr(supabase_client, "SUPABASE_SERVICE_KEY", "service-key")
+
+
+class TestRestPost:
+    """Test REST inserts."""
+
+    def test_not_configured(self, monkeypatch):
+        """Test that nothing is sent without credentials."""
+        monkeypatch.setattr(supabase_client, "SUPABASE_URL", "")
+        with patch.object(supabase_client._SESSION, 'post') as mock_post:
+            supabase_client.rest_post("games", [{"id": 1}])
+        mock_post.assert_not_called()
+
+    def test_chunks_large_batches(self, configured, monkeypatch):
+        """Test that rows are split into POST_BATCH_SIZE chunks."""
+        monkeypatch.setattr(supabase_client, "POST_BATCH_SIZE", 2)
+        with patch.object(supabase_client._SESSION, 'post') as mock_post:
+            supabase_client.rest_post("games", [{"id": i} for i in range(5)], on_conflict="id")
+
+        assert mock_post.call_count == 3
+        url = mock_post.call_args[0][0]
+        assert url == "https://example.supabase.co/rest/v1/games?on_conflict=id"
+        assert json.loads(mock_post.call_args[1]["data"]) == [{"id": 4}]
+
+    def test_error_status_is_logged(self, configured, caplog):
+        """Test that a rejected insert is logged instead of raising."""
+        with patch.object(supabase_client._SESSION, 'post') as mock_post:
+            mock_post.return_value.ok = False
+            mock_post.return_value.status_code = 400
+            mock_post.return_value.text = "duplicate key"
+            supabase_client.rest_post("odds", [{"id": "ev1"}])
+
+        assert "returned 400" in caplog.text
+
+    def test_post_retries_only_safe_failures(self):
+        """Test that read errors are never retried, so inserts aren't doubled."""
+        retry = supabase_client._SESSION.get_adapter("https://x.supabase.co").max_retries
+
+        assert retry.read == 0
+        assert retry.is_retry("POST", 503)
+        assert not retry.is_retry("POST", 500)
+
+    def test_gzip_large_bodies(self, configured, monkeypatch):
+        """Test that large bodies are gzipped when SUPABASE_GZIP is on."""
+        monkeypatch.setattr(supabase_client, "SUPABASE_GZIP", True)
+        rows = [{"id": i, "raw": "x" * 50} for i in range(50)]
+        with patch.object(supabase_client._SESSION, 'post') as mock_post:
+            supabase_client.rest_post("odds", rows)
+
+        kwargs = mock_post.call_args[1]
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(kwargs["data"])) == rows
+
+    def test_gzip_off_by_default(self, configured):
+        """Test that bodies are sent uncompressed unless enabled."""
+        with patch.object(supabase_client._SESSION, 'post') as mock_post:
+            supabase_client.rest_post("odds", [{"id": i, "raw": "x" * 50} for i in range(50)])
+
+        assert "Content-Encoding" not in mock_post.call_args[1]["headers"]
+
+
+class TestQueryClient:
+    """Test the minimal query client used by odds_etl."""
+
+    @patch.object(supabase_client._SESSION, 'get')
+    def test_execute_decodes_body(self, mock_get, configured):
+        """Test that select().eq().execute() returns the decoded rows."""
+        mock_get.return_value.content = b'[{"team_abbr": "CHI"}]'
+
+        resp = supabase_client.get_supabase_client().table("games_odds").select("*").eq("team_abbr", "CHI").execute()
+
+        assert resp.data == [{"team_abbr": "CHI"}]
+        assert mock_get.call_args[1]["params"] == {"select": "*", "team_abbr": "eq.CHI"}
+
+    @patch.object(supabase_client._SESSION, 'post')
+    def test_insert_sends_json_bytes(self, mock_post, configured):
+        """Test that inserts send a serialized body and decode the representation."""
+        mock_post.return_value.content = b'[{"id": 1}]'
+
+        resp = supabase_client.get_supabase_client().table("games_odds").insert([{"id": 1}]).execute()
+
+        assert resp.data == [{"id": 1}]
+        kwargs = mock_post.call_args[1]
+        assert json.loads(kwargs["data"]) == [{"id": 1}]
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert kwargs["headers"]["Prefer"] == "return=representation"
+        # the shared headers used by rest_post are left untouched
+        assert supabase_client._headers()["Prefer"] == "return=minimal"
+
+    def test_client_is_reused(self, configured):
+        """Test that the query client is created once per configuration."""
+        first = supabase_client.get_supabase_client()
+
+        assert first is supabase_client.get_supabase_client()
+
+    def test_not_configured_returns_none(self, monkeypatch):
+        """Test that missing credentials yield no client."""
+        monkeypatch.setattr(supabase_client, "SUPABASE_URL", "")
+
+        assert supabase_client.get_supabase_client() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])